@@ -0,0 +1,246 @@
+"""
+Dispatch latency of @pattern compared to a native match statement and
+functools.singledispatch.
+
+    python benchmarks/bench_pattern_match.py
+    python benchmarks/bench_pattern_match.py --cases 1,10,50 --number 200000
+
+For every case count we generate a module that defines the same dispatch
+three ways, import it and time calls that hit the first and the last case.
+Pattern kinds:
+
+    scalar      ~ 3 | ...                    case 3:
+    instance    ~ C3 | ...                   case C3():        + singledispatch
+    multi       ~ C3, int | ...              case (C3(), int()):
+    guarded     ~ int [when: x == 3] | ...   case int() if x == 3:
+
+Argument binding styles are measured on the scalar kind: positional,
+keyword, and a signature with defaults and keyword-only args.
+
+Build time is the cost of building the pattern from source with the
+pattern cache disabled.
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from earthdragon import pattern_cache  # noqa: E402
+from earthdragon.pattern_match import pattern  # noqa: E402
+
+
+HEADER = '''\
+import functools
+from earthdragon.pattern_match import pattern
+
+'''
+
+
+def gen_classes(n):
+    return ''.join(f'class C{i}: pass\n' for i in range(n)) + '\n'
+
+
+def gen_scalar(n, signature='x'):
+    pat = ['@pattern', f'def pat_scalar({signature}):', '    meta[match: x]', '']
+    pat += [f'    ~ {i} | {i}' for i in range(n)]
+    pat += ['    ~ default | -1', '']
+
+    native = [f'def native_scalar({signature}):', '    match x:']
+    for i in range(n):
+        native += [f'        case {i}:', f'            return {i}']
+    native += ['        case _:', '            return -1', '']
+    return '\n'.join(pat + native) + '\n'
+
+
+def gen_instance(n):
+    pat = ['@pattern', 'def pat_instance(x):', '    meta[match: x]', '']
+    pat += [f'    ~ C{i} | {i}' for i in range(n)]
+    pat += ['    ~ default | -1', '']
+
+    native = ['def native_instance(x):', '    match x:']
+    for i in range(n):
+        native += [f'        case C{i}():', f'            return {i}']
+    native += ['        case _:', '            return -1', '']
+
+    single = [
+        '@functools.singledispatch',
+        'def single_instance(x):',
+        '    return -1',
+        '',
+    ]
+    for i in range(n):
+        single += [
+            '@single_instance.register',
+            f'def _(x: C{i}):',
+            f'    return {i}',
+            '',
+        ]
+    return '\n'.join(pat + native + single) + '\n'
+
+
+def gen_multi(n):
+    pat = ['@pattern', 'def pat_multi(x, y):', '    meta[match: x, y]', '']
+    pat += [f'    ~ C{i}, int | {i}' for i in range(n)]
+    pat += ['    ~ default | -1', '']
+
+    native = ['def native_multi(x, y):', '    match (x, y):']
+    for i in range(n):
+        native += [f'        case (C{i}(), int()):', f'            return {i}']
+    native += ['        case _:', '            return -1', '']
+    return '\n'.join(pat + native) + '\n'
+
+
+def gen_guarded(n):
+    pat = ['@pattern', 'def pat_guarded(x):', '    meta[match: x]', '']
+    pat += [f'    ~ int [when: x == {i}] | {i}' for i in range(n)]
+    pat += ['    ~ default | -1', '']
+
+    native = ['def native_guarded(x):', '    match x:']
+    for i in range(n):
+        native += [f'        case int() if x == {i}:', f'            return {i}']
+    native += ['        case _:', '            return -1', '']
+    return '\n'.join(pat + native) + '\n'
+
+
+def load_module(source, directory, name):
+    path = os.path.join(directory, f'{name}.py')
+    with open(path, 'w') as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def time_call(stmt, ns, number):
+    """ best of 5, in ns per call """
+    timer = timeit.Timer(stmt, globals=ns)
+    best = min(timer.repeat(repeat=5, number=number))
+    return best / number * 1e9
+
+
+def time_build(module, name):
+    raw = getattr(module, name).__wrapped__
+    timer = timeit.Timer(lambda: pattern(raw, eager=True))
+    return min(timer.repeat(repeat=3, number=5)) / 5 * 1e6
+
+
+def bench_cases(n, directory, number):
+    source = (
+        HEADER
+        + gen_classes(n)
+        + gen_scalar(n)
+        + gen_instance(n)
+        + gen_multi(n)
+        + gen_guarded(n)
+    )
+    mod = load_module(source, directory, f'_bench_cases_{n}')
+    for name in ['pat_scalar', 'pat_instance', 'pat_multi', 'pat_guarded']:
+        getattr(mod, name).build()
+
+    ns = vars(mod)
+    ns['first'] = mod.C0()
+    ns['last'] = getattr(mod, f'C{n-1}')()
+    last = n - 1
+
+    rows = []
+    kinds = [
+        ('scalar', 'pat_scalar(0)', 'native_scalar(0)', None,
+         f'pat_scalar({last})', f'native_scalar({last})', None),
+        ('instance', 'pat_instance(first)', 'native_instance(first)',
+         'single_instance(first)', 'pat_instance(last)',
+         'native_instance(last)', 'single_instance(last)'),
+        ('multi', 'pat_multi(first, 1)', 'native_multi(first, 1)', None,
+         'pat_multi(last, 1)', 'native_multi(last, 1)', None),
+        ('guarded', 'pat_guarded(0)', 'native_guarded(0)', None,
+         f'pat_guarded({last})', f'native_guarded({last})', None),
+    ]
+    for kind, *stmts in kinds:
+        pat_first, native_first, single_first = stmts[:3]
+        pat_last, native_last, single_last = stmts[3:]
+        build = time_build(mod, f'pat_{kind}')
+        for hit, pat_stmt, native_stmt, single_stmt in [
+            ('first', pat_first, native_first, single_first),
+            ('last', pat_last, native_last, single_last),
+        ]:
+            rows.append((
+                n, kind, hit,
+                time_call(pat_stmt, ns, number),
+                time_call(native_stmt, ns, number),
+                single_stmt and time_call(single_stmt, ns, number),
+                build,
+            ))
+    return rows
+
+
+def bench_binding(directory, number, n=10):
+    styles = [
+        ('positional', 'x', 'pat_scalar({v})', 'native_scalar({v})'),
+        ('keyword', 'x', 'pat_scalar(x={v})', 'native_scalar(x={v})'),
+        ('defaults', 'x, y=0, *args, flag=False, **kwargs',
+         'pat_scalar({v}, 1, flag=True)', 'native_scalar({v}, 1, flag=True)'),
+    ]
+    rows = []
+    for style, signature, pat_stmt, native_stmt in styles:
+        source = HEADER + gen_scalar(n, signature)
+        mod = load_module(source, directory, f'_bench_binding_{style}')
+        mod.pat_scalar.build()
+        ns = vars(mod)
+        v = n - 1
+        rows.append((
+            style,
+            time_call(pat_stmt.format(v=v), ns, number),
+            time_call(native_stmt.format(v=v), ns, number),
+        ))
+    return rows
+
+
+def fmt(value):
+    if value is None:
+        return '-'
+    return f'{value:,.0f}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--cases', default='1,5,10,30')
+    parser.add_argument('--number', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    counts = [int(c) for c in args.cases.split(',')]
+
+    # always measure a real build
+    os.environ[pattern_cache.ENV_VAR] = '0'
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(
+            f"{'cases':>5} {'kind':>9} {'hit':>6} {'pattern ns':>11} "
+            f"{'match ns':>9} {'single ns':>10} {'ratio':>6} "
+            f"{'build us':>9}"
+        )
+        for n in counts:
+            for n, kind, hit, pat, native, single, build in bench_cases(
+                n, directory, args.number
+            ):
+                print(
+                    f'{n:>5} {kind:>9} {hit:>6} {fmt(pat):>11} '
+                    f'{fmt(native):>9} {fmt(single):>10} '
+                    f'{pat / native:>6.2f} {fmt(build):>9}'
+                )
+
+        print()
+        print(f"{'binding':>10} {'pattern ns':>11} {'match ns':>9} {'ratio':>6}")
+        for style, pat, native in bench_binding(directory, args.number):
+            print(
+                f'{style:>10} {fmt(pat):>11} {fmt(native):>9} '
+                f'{pat / native:>6.2f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
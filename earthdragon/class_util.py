@@ -1,6 +1,5 @@
 import types
 import inspect
-from inspect import classify_class_attrs, getclosurevars
 
 from .func_util import replace_class_closure
 
@@ -9,25 +8,59 @@ def init_name(mixin):
     return '__init_{mixin_name}'.format(mixin_name=mixin.__name__)
 
 
+def attr_kind(obj):
+    """ inspect.classify_class_attrs kind for a class dict value """
+    if isinstance(obj, staticmethod):
+        return 'static method'
+    if isinstance(obj, classmethod):
+        return 'class method'
+    if isinstance(obj, property):
+        return 'property'
+    if inspect.isroutine(obj):
+        return 'method'
+    return 'data'
+
+
 def class_attrs(cls):
     """
-    Returns a dict of 
+    Returns a dict of
     {
         attr_name : dict of inspect.Attribute,
     }
     excluding any attribute inherited from object.
+
+    Same shape as inspect.classify_class_attrs, but only reads the
+    __dict__ of each class in the mro. object is the raw class dict value.
     """
-    attrs = classify_class_attrs(cls)
-    non_object_attrs = [
-        attr for attr in attrs if attr.defining_class != object
-    ]
     class_attr_dict = {}
-    for attr in non_object_attrs:
-        attr_dict = {name: getattr(attr, name) for name in attr._fields}
-        class_attr_dict[attr.name] = attr_dict
+    for klass in cls.__mro__:
+        if klass is object:
+            continue
+        for name, obj in klass.__dict__.items():
+            if name in class_attr_dict:
+                continue
+            class_attr_dict[name] = {
+                'name': name,
+                'kind': attr_kind(obj),
+                'defining_class': klass,
+                'object': obj,
+            }
     return class_attr_dict
 
 
+def mro_lookup(cls, name, default=None):
+    """
+    Raw class dict value for name, following the mro but skipping object.
+    Unlike getattr, descriptors aren't invoked.
+    """
+    for klass in cls.__mro__:
+        if klass is object:
+            continue
+        if name in klass.__dict__:
+            return klass.__dict__[name]
+    return default
+
+
 def get_bindable(obj, base):
     """
     attr : dict of inspect.Attribute
@@ -40,8 +73,7 @@ def get_bindable(obj, base):
     if not isinstance(obj, types.FunctionType):
         return obj
 
-    closurevars = getclosurevars(obj)
-    if '__class__' in closurevars.nonlocals:
+    if '__class__' in obj.__code__.co_freevars:
         obj = replace_class_closure(obj, base)
     return obj
 
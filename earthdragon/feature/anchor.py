@@ -62,7 +62,14 @@ def _parent_anchors(bases):
     if not bases:
         return {}
     base_dict = bases[0].__dict__
-    return {k:v for k, v in base_dict.items() if isinstance(v, Attr)}
+    anchors = {k:v for k, v in base_dict.items() if isinstance(v, Attr)}
+    # AnchorMeta classes keep their anchors even if the class dict entry
+    # has since been flattened, see FeatureMeta. Attrs set on the class
+    # afterwards (e.g. by mix) are only in the class dict.
+    stored = base_dict.get('_earthdragon_anchors')
+    if stored is not None:
+        anchors = dict(stored, **anchors)
+    return anchors
 
 def _get_anchor_name(k, v):
     anchor_name = k
@@ -166,4 +173,5 @@ class AnchorMeta(MetaMeta):
     def __new__(cls, name, bases, dct):
         update = anchor_updates(dct, bases)
         dct.update(update)
+        dct['_earthdragon_anchors'] = update
         return super().__new__(cls, name, bases, dct)
@@ -20,9 +20,10 @@ class Attr:
         When you don't have a concrete implementation but want to add a
         hook, pipeline, or transform.
 
-        Note, we don't know which attribute name this Attr represents until
-        `__get__`. We get the attribute name at runtime by checking
-        obj.__class__.__dict__.
+        The base func is resolved by name in `__set_name__` when the class
+        is created. An Attr attached to a class afterwards doesn't get
+        `__set_name__`, so it finds its name and base func on first
+        `__get__` by checking obj.__class__.__dict__.
 
     Usage 2:
         ```
@@ -32,6 +33,8 @@ class Attr:
         __init__.add_hook(hook)
         ```
     """
+    name = None
+
     def __init__(self, func=None):
         if func is None:
             decorator = MultiDecorator()
@@ -62,6 +65,19 @@ class Attr:
             return getattr(self.decorator, name)
         raise AttributeError(name)
 
+    def __set_name__(self, owner, name):
+        if self.name is None:
+            self.name = name
+
+        # only classes built by AnchorMeta resolve eagerly. A plain feature
+        # class would pick up object.__init__ or its base's method, which
+        # mix would then install as the feature's own.
+        if self.decorator.orig_func is None \
+                and '_earthdragon_anchors' in owner.__dict__:
+            base_func = self._find_func(owner, name)
+            if base_func is not None:
+                self.set_func(base_func)
+
     def __get__(self, obj, cls=None):
         if obj is None:
             return self
@@ -75,14 +91,20 @@ class Attr:
     def set_func(self, func):
         self.decorator = self.decorator(func)
 
-    def _find_func(self, obj):
+    def _find_func(self, obj, name=None):
         """
         Grab base func represented by this Attibute and bind it to
         MultiDecorator
+
+        name : str
+            Look up by name instead of searching for self. Only valid when
+            obj is the class whose __dict__ holds this Attr.
         """
         # get unbound
-        owner, base_func = get_unbounded_super(obj, self)
+        owner, base_func = get_unbounded_super(obj, name or self)
         if isinstance(base_func, Attr):
+            if base_func.orig_func is not None:
+                return base_func.orig_func
             base_func = base_func._find_func(owner)
 
         if isinstance(base_func, MultiDecorator):
@@ -99,4 +121,11 @@ class Attr:
         """
         decorators = [attr.decorator for attr in attrs]
         deco = MultiDecorator.combine(*decorators)
-        return cls(deco)
+        return cls._wrap(deco)
+
+    @classmethod
+    def _wrap(cls, decorator):
+        """ Attr around decorator without the copy __init__ makes """
+        attr = cls.__new__(cls)
+        attr.decorator = decorator
+        return attr
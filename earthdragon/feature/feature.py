@@ -1,4 +1,6 @@
-from ..class_util import class_attrs, set_class_attr, init_name
+import weakref
+
+from ..class_util import class_attrs, mro_lookup, set_class_attr, init_name
 from ..multidecorator import MultiDecorator, only_self, system
 from ..pattern_match import pattern
 from .anchor import AnchorMeta
@@ -6,12 +8,15 @@ from .anchor import AnchorMeta
 from .attr import Attr
 from types import FunctionType
 
+_missing = object()
+
+
 class features:
     def __init__(self, *args):
         self.features = args
 
     def __call__(self, cls):
-        mix(cls, self.features[0])
+        mix(cls, *self.features)
         return cls
 
 @system
@@ -27,8 +32,48 @@ def run_feature_inits(self):
     yield
 
 class FeatureMeta(AnchorMeta):
-    def __new__(cls, name, bases, dct):
-        return super().__new__(cls, name, bases, dct)
+    """
+    flatten : bool
+        Install anchors with no hooks, pipelines or transforms in the class
+        dict as their plain function, so calling them skips the
+        Attr -> MultiDecorator -> MethodDecorator chain. The Attrs stay in
+        _earthdragon_anchors for subclasses to build on. Inherited by
+        subclasses.
+
+        Since this is decided at class creation, hooks on a flattened
+        class have to be added in the class body (or via @hook) rather
+        than to the class attribute afterwards.
+
+        class Point(FeatureBase, flatten=True):
+            @Attr
+            def norm(self):
+                ...
+    """
+    def __new__(cls, name, bases, dct, flatten=None):
+        if flatten is None:
+            flatten = any(
+                getattr(base, '_earthdragon_flatten', False) for base in bases
+            )
+        if flatten:
+            dct['_earthdragon_flatten'] = True
+        new_cls = super().__new__(cls, name, bases, dct)
+        if flatten:
+            flatten_anchors(new_cls)
+        return new_cls
+
+
+def flat_func(attr):
+    """ the plain function an Attr reduces to, None if it wraps anything """
+    if attr.hooks or attr.pipelines or attr.transforms:
+        return None
+    return attr.orig_func
+
+
+def flatten_anchors(cls):
+    for name, attr in cls.__dict__['_earthdragon_anchors'].items():
+        func = flat_func(attr)
+        if func is not None:
+            setattr(cls, name, func)
 
 class FeatureBase(metaclass=FeatureMeta):
     __init__ = Attr()
@@ -38,51 +83,97 @@ class FeatureBase(metaclass=FeatureMeta):
 class FeatureInvariantError(Exception):
     pass
 
-def mix(base, feature):
+def mix(base, *features):
     """
     Parameters
     ----------
     base : Component Class
-    feature : Class
+    features : Classes
 
     Note:
         The feature.__init__ is called at the end of BaseComponent.__init__.
     """
     _features_ = getattr(base, '_features_')[:] # copy so we don't modify ancestor
-    if feature in _features_:
-        msg = '{feature_name} already mixed'.format(feature_name=feature_name.__name__)
-        print(msg)
+    new_features = []
+    for feature in features:
+        if feature in _features_ or feature in new_features:
+            msg = '{feature_name} already mixed'.format(feature_name=feature.__name__)
+            print(msg)
+            continue
+        new_features.append(feature)
+
+    if not new_features:
         return False
 
-    _features_.append(feature)
-    mix_feature(base, feature)
+    _features_.extend(new_features)
+    mix_features(base, new_features)
     setattr(base, '_features_', _features_)
 
-def mix_feature(base, feature):
+_feature_attrs = weakref.WeakKeyDictionary()
+
+
+def feature_attrs(feature):
+    """
+    class_attrs of a feature class. Cached, features are mixed into many
+    classes and aren't expected to change once defined. Don't mutate.
+    """
+    try:
+        return _feature_attrs[feature]
+    except KeyError:
+        pass
     attrs = class_attrs(feature)
-    base_attrs = class_attrs(base)
+    _feature_attrs[feature] = attrs
+    return attrs
 
-    feature_init = attrs.pop('__init__', None) # handled via setup_base_init above
-    base_init = base_attrs.get('__init__', None)
-    base_init_dec = base_init['object']
-    assert isinstance(base_init_dec, (Attr)), 'should have been added via metaclass'
-    if feature_init:
-        if isinstance(feature_init['object'], (Attr, MultiDecorator)):
-            feature_init_object = feature_init['object']
-            base_init_dec.update(feature_init_object)
-            feature_init['object'] = feature_init_object.orig_func
 
-        attrs[init_name(feature)] = feature_init
+def mix_feature(base, feature):
+    mix_features(base, [feature])
 
-    # need non closured function. messed up super
-    for key, attr in attrs.items():
-        # assuming dunder data objects are python meta attrs
-        # this can be wrong. Maybe detect against base object and skip
-        # data objects that are the same?
-        if key.startswith('__') and key.endswith('__') and attr['kind'] == 'data':
-            continue
 
-        if key in base_attrs:
-            raise FeatureInvariantError("Cannot duplicate attrs names with features")
+def mix_features(base, features):
+    """
+    Mix all features into base at once. Attrs are gathered and checked for
+    conflicts before base is touched, and the feature __init__ hooks are
+    combined so base.__init__ is only updated once.
+    """
+    attrs = {}
+    init_decorators = []
+    for feature in features:
+        feature_attrs_ = dict(feature_attrs(feature))
 
+        feature_init = feature_attrs_.pop('__init__', None) # handled via setup_base_init above
+        if feature_init:
+            feature_init_object = feature_init['object']
+            if isinstance(feature_init_object, (Attr, MultiDecorator)):
+                init_decorators.append(getattr(
+                    feature_init_object, 'decorator', feature_init_object))
+                feature_init = dict(
+                    feature_init,
+                    object=feature_init_object.orig_func,
+                )
+
+            feature_attrs_[init_name(feature)] = feature_init
+
+        for key, attr in feature_attrs_.items():
+            # assuming dunder data objects are python meta attrs
+            # this can be wrong. Maybe detect against base object and skip
+            # data objects that are the same?
+            if key.startswith('__') and key.endswith('__') and attr['kind'] == 'data':
+                continue
+
+            if key in attrs or mro_lookup(base, key, _missing) is not _missing:
+                raise FeatureInvariantError("Cannot duplicate attrs names with features")
+            attrs[key] = attr
+
+    base_init_dec = mro_lookup(base, '__init__')
+    assert isinstance(base_init_dec, (Attr)), 'should have been added via metaclass'
+    if init_decorators:
+        if len(init_decorators) == 1:
+            init_decorator, = init_decorators
+        else:
+            init_decorator = MultiDecorator.combine(*init_decorators)
+        base_init_dec.update(Attr._wrap(init_decorator))
+
+    # need non closured function. messed up super
+    for key, attr in attrs.items():
         set_class_attr(base, key, attr['object'])
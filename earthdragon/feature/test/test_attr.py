@@ -65,3 +65,39 @@ def test_find_orig_func():
     # this behavior could change...
     c = Child()
     assert c.a() == 2
+
+
+def test_find_orig_func_at_class_creation():
+    from ..anchor import AnchorMeta
+
+    class GrandFather:
+        def a(self):
+            return 1
+
+    class Parent(GrandFather, metaclass=AnchorMeta):
+        a = Attr()
+        a.add_pipeline(lambda x: x+2)
+
+    class Child(Parent):
+        a = Attr()
+
+    # resolved without ever calling __get__ on an instance
+    assert Parent.__dict__['a'].orig_func is GrandFather.a
+    assert Child.__dict__['a'].orig_func is GrandFather.a
+    assert Child().a() == 3
+
+    # plain classes, like feature classes, resolve on first access
+    class Plain(GrandFather):
+        a = Attr()
+
+    assert Plain.__dict__['a'].orig_func is None
+    assert Plain().a() == 1
+
+    # attached after creation, falls back to resolving on first access
+    class Late(GrandFather):
+        pass
+
+    Late.a = Attr()
+    assert Late.__dict__['a'].orig_func is None
+    assert Late().a() == 1
+    assert Late.__dict__['a'].orig_func is GrandFather.a
@@ -81,6 +81,91 @@ def test_multiple_feature():
     assert f.woot is True
 
 
+def test_features_mixed_together():
+    @features(BareFeature, WootFeature)
+    class Both(FeatureBase):
+        pass
+
+    assert Both._features_ == [BareFeature, WootFeature]
+
+    f = Both()
+    assert f.touched is True
+    assert f.init_feature == 13
+    assert f.woot is True
+
+
+def test_features_conflict_checked_first():
+    class Hello:
+        def hello(self):
+            return 'hello'
+
+    class AlsoHello:
+        def hello(self):
+            return 'also'
+
+    class Plain(FeatureBase):
+        pass
+
+    hooks = list(Plain.__init__.hooks)
+    with pytest.raises(feature.feature.FeatureInvariantError):
+        features(WootFeature, Hello, AlsoHello)(Plain)
+
+    # nothing was mixed in
+    assert Plain._features_ == []
+    assert Plain.__init__.hooks == hooks
+    assert 'hello' not in Plain.__dict__
+
+
+def test_feature_inherited_init_not_mixed():
+    class Base:
+        def __init__(self, required):
+            self.required = required
+
+    class InheritsInit(Base):
+        @only_self
+        def inherits_init(self):
+            self.inherits = True
+            yield
+
+        __init__ = Attr()
+        __init__.add_hook(inherits_init)
+
+    @features(InheritsInit)
+    class Plain(FeatureBase):
+        pass
+
+    # Base.__init__ isn't the feature's init, so it isn't called
+    assert getattr(Plain, '__init_InheritsInit') is None
+    p = Plain()
+    assert p.inherits is True
+    assert not hasattr(p, 'required')
+
+
+def test_mixed_in_attr_is_anchor():
+    calls = []
+
+    @only_self
+    def count(self):
+        calls.append(1)
+        yield
+
+    class Ping:
+        @Attr
+        def ping(self):
+            return 'ping'
+        ping.add_hook(count)
+
+    @features(Ping)
+    class Base(FeatureBase):
+        pass
+
+    class Child(Base):
+        ping = Attr()
+
+    assert Child().ping() == 'ping'
+    assert calls == [1]
+
+
 def test_simple_init():
     """
     When an Attr is in parent and we just have a normal method, defining
@@ -129,3 +214,74 @@ def test_hooks_called_once():
     # wrapper funcs called once
     assert count == 1
     assert EVENTS == [c]
+
+
+def test_flatten():
+    from ..anchor import hook as anchor_hook
+
+    class Base(FeatureBase, flatten=True):
+        @Attr
+        def plain(self, x):
+            return x
+
+        @Attr
+        def hooked(self, x):
+            return x
+
+        @anchor_hook('hooked')
+        def count(self, x):
+            self.calls = getattr(self, 'calls', 0) + 1
+            yield
+
+    # nothing wraps plain, so it's installed as the function itself
+    assert Base.__dict__['plain'] is Base._earthdragon_anchors['plain'].orig_func
+    assert isinstance(Base.__dict__['hooked'], Attr)
+    assert isinstance(Base.__dict__['__init__'], Attr)
+
+    b = Base()
+    assert b.plain(1) == 1
+    assert b.hooked(2) == 2
+    assert b.calls == 1
+
+    # a subclass can still hook the flattened anchor
+    class Child(Base):
+        @anchor_hook('plain')
+        def log(self, x):
+            self.logged = x
+            yield
+
+    c = Child()
+    assert c.plain(3) == 3
+    assert c.logged == 3
+    assert isinstance(Child.__dict__['plain'], Attr)
+
+    # flatten is inherited
+    class GrandChild(Child):
+        @Attr
+        def extra(self):
+            return 'extra'
+
+    g = GrandChild()
+    g.plain(4)
+    assert g.logged == 4
+    assert isinstance(GrandChild.__dict__['plain'], Attr)
+    assert not isinstance(GrandChild.__dict__['extra'], Attr)
+    assert g.extra() == 'extra'
+
+
+def test_late_hook():
+    class Base(FeatureBase):
+        @Attr
+        def plain(self, x):
+            return x
+
+    @only_self
+    def log(self):
+        self.logged = True
+        yield
+
+    # not flattened unless asked for, so the class attribute is the Attr
+    Base.plain.add_hook(log)
+    b = Base()
+    assert b.plain(1) == 1
+    assert b.logged is True
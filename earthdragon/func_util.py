@@ -75,11 +75,20 @@ def replace_class_closure(func, class_):
     However, this messes up methods when they are attached to a diferent
     class.
     """
-    closurevars = inspect.getclosurevars(func)
-    assert '__class__' in closurevars.nonlocals
+    freevars = func.__code__.co_freevars
+    assert '__class__' in freevars
+
+    # keep the cells of any other free variables
+    closure = list(func.__closure__)
+    closure[freevars.index('__class__')] = make_cell(class_)
 
     new_func = types.FunctionType(func.__code__, func.__globals__,
-                                  closure=(make_cell(class_),))
+                                  func.__name__, func.__defaults__,
+                                  tuple(closure))
+    new_func.__kwdefaults__ = func.__kwdefaults__
+    new_func.__qualname__ = func.__qualname__
+    new_func.__doc__ = func.__doc__
+    new_func.__dict__.update(func.__dict__)
     return new_func
 
 
@@ -1,14 +1,18 @@
 """
 Meta tools for class construction.
 """
-from collections import OrderedDict
 import inspect
 import ctypes
+import weakref
 
 def reload_locals(frame):
     ctypes.pythonapi.PyFrame_LocalsToFast(ctypes.py_object(frame), ctypes.c_int(1))
 
-class MetaDict(OrderedDict):
+class MetaDict(dict):
+    """
+    Class body namespace that runs setitem_handler on every assignment.
+    MetaMeta uses a metadict_class subclass per handler.
+    """
     def __init__(self, setitem_handler, *args, **kwargs):
         self.setitem_handler = setitem_handler
         self.classdict = ClassDict(self)
@@ -44,11 +48,43 @@ class ClassDict:
     def keys(self):
         return self.dct.keys()
 
+_metadict_classes = weakref.WeakKeyDictionary()
+
+
+def metadict_class(setitem_handler):
+    """
+    MetaDict subclass whose __setitem__ closes over setitem_handler, saving
+    the attribute lookups and super() call per class body assignment.
+    Cached per handler.
+    """
+    try:
+        return _metadict_classes[setitem_handler]
+    except KeyError:
+        pass
+
+    def __setitem__(self, key, value, handler=setitem_handler,
+                    setitem=dict.__setitem__):
+        if handler(key, value, self.classdict) is False:
+            return
+        setitem(self, key, value)
+
+    name = 'MetaDict_{name}'.format(name=setitem_handler.__name__)
+    klass = type(name, (MetaDict,), {'__setitem__': __setitem__})
+    _metadict_classes[setitem_handler] = klass
+    return klass
+
+
 class MetaMeta(type):
+    """
+    Metaclass whose class body assignments go through setitem_handler.
+    When the handler isn't overridden, the class body is a plain dict.
+    """
     @classmethod
-    def __prepare__(mcl, name, bases):
-        mdict = MetaDict(mcl.setitem_handler)
-        return mdict
+    def __prepare__(mcl, name, bases, **kwargs):
+        setitem_handler = mcl.setitem_handler
+        if setitem_handler is MetaMeta.setitem_handler:
+            return {}
+        return metadict_class(setitem_handler)(setitem_handler)
 
     def setitem_handler(key, value, scope):
         return True
@@ -83,9 +83,16 @@ class MultiDecorator:
     run before and after pipeline. The only time you will need to care about
     decoration order is if you add multiple functions of the same type. But
     it should be easier to reason about that ordering.
+
+    The hooks/transforms/pipelines lists are shared copy on write between
+    decorators built with update/combine, which is how anchors cascade down
+    a class hierarchy. Treat them as read only and go through the add_*
+    methods.
     """
     orig_func = None
 
+    KINDS = ('hooks', 'transforms', 'pipelines')
+
     def __init__(self, func=None):
         if func:
             self.set_func(func)
@@ -93,6 +100,8 @@ class MultiDecorator:
         self.hooks = []
         self.transforms = []
         self.pipelines = []
+        # kinds whose list isn't shared with another decorator
+        self._owned = set(self.KINDS)
 
     def set_func(self, func):
         if self.orig_func:
@@ -130,7 +139,18 @@ class MultiDecorator:
         self.sort_hooks()
 
     def sort_hooks(self):
-        self.hooks.sort(key=lambda x: isinstance(x, first), reverse=True)
+        hooks = self.hooks
+        key = lambda x: isinstance(x, first)
+        if hooks == sorted(hooks, key=key, reverse=True):
+            return
+        self._own('hooks').sort(key=key, reverse=True)
+
+    def _own(self, kind):
+        """ list for kind, copied first if it's shared """
+        if kind not in self._owned:
+            setattr(self, kind, list(getattr(self, kind)))
+            self._owned.add(kind)
+        return getattr(self, kind)
 
     def add_transform(self, transform):
         self._func = None # unset func cache
@@ -179,12 +199,19 @@ class MultiDecorator:
 
         _hooks = self._prime_hooks(__is_method, args, kwargs)
 
-        for _hook in _hooks:
-            next(_hook, None)
+        try:
+            for _hook in _hooks:
+                next(_hook, None)
 
-        # pipeline
-        ret = self.func(*args, **kwargs)
-        ret = self.pipeline(ret)
+            # pipeline
+            ret = self.func(*args, **kwargs)
+            ret = self.pipeline(ret)
+        except BaseException:
+            # run the hooks' finally blocks now rather than whenever the
+            # generators are collected, which the traceback can delay.
+            for _hook in reversed(_hooks):
+                _hook.close()
+            raise
 
         # do post hooks in reverse order
         for hook in _hooks[::-1]:
@@ -198,30 +225,57 @@ class MultiDecorator:
         return ret
 
     def update(self, other):
-        for type_ in ['hooks', 'transforms', 'pipelines']:
-            self_funcs = getattr(self, type_)
-            other_funcs = getattr(other, type_)
-            duplicate = set(self_funcs) & set(other_funcs)
-            adder = getattr(self, 'add_{typ}'.format(typ=type_[:-1]))
+        """
+        Add other's hooks/transforms/pipelines after our own. When we have
+        none of a kind, other's list is shared instead of copied.
+        """
+        # other's funcs were checked and its hooks sorted when they were
+        # added, so sharing its list needs neither.
+        for kind in self.KINDS:
+            other_funcs = getattr(other, kind)
+            if not other_funcs:
+                continue
+
+            if kind == 'transforms':
+                self._func = None
+            if kind == 'pipelines':
+                self._pipeline = None
+
+            self_funcs = getattr(self, kind)
+            if not self_funcs:
+                setattr(self, kind, other_funcs)
+                self._owned.discard(kind)
+                other._owned.discard(kind)
+                continue
+
+            existing = set(self_funcs)
+            new_funcs = []
             for func in other_funcs:
-                adder(func)
-
-        self.sort_hooks()
+                if func in existing:
+                    self._check_duplicate(func)
+                    continue
+                existing.add(func)
+                new_funcs.append(func)
+            self._own(kind).extend(new_funcs)
+
+            if kind == 'hooks':
+                self.sort_hooks()
+
+    def _check_duplicate(self, func):
+        if not isinstance(func, system):
+            # because ordering might be important, we error here
+            # till we find out how it should be handled.
+            raise DuplicateWrapperError("Attempted to add existing func")
 
     def _add_func(self, func, kind):
         assert kind in ['hook', 'pipeline', 'transform']
         existing = getattr(self, kind + 's')
-        duplicate = func in existing
-        system_type = isinstance(func, system)
-        if duplicate and not system_type:
-            # because ordering might be important, we error here
-            # till we find out how it should be handled.
-            raise DuplicateWrapperError("Attempted to add existing func")
-        if duplicate and system_type:
+        if func in existing:
             # already have system hook, do nothing
+            self._check_duplicate(func)
             return
 
-        existing.append(func)
+        self._own(kind + 's').append(func)
 
     # act like a method
     def __get__(self, obj, cls=None):
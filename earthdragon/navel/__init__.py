@@ -1,3 +1,3 @@
-from .navel import Navel, NavelMeta, features
-from .lockable import mutate, UnexpectedMutationError
+from .navel import Navel, FrozenNavel, NavelMeta, features
+from .lockable import mutate, UnexpectedMutationError, Freezable
 from ..feature import Attr
@@ -1,42 +1,145 @@
-from earthdragon.typelet import Int
 from earthdragon.multidecorator import (
     MultiDecorator,
-    require_self,
     only_self,
     first
 )
-from ..feature import Attr, features
+from ..feature import Attr
 
 class UnexpectedMutationError(Exception):
     pass
 
-class Lockable:
+# id(obj) -> unlock depth of the Lockable objects inside __init__ or a
+# @mutate call. Kept off the instance: touching obj.__dict__ materialises
+# it, and attribute reads on an object with a materialised __dict__ are
+# about 3x slower.
+_unlocked = {}
 
-    _in_flight = Int(default=0)
+@first
+@only_self
+def unlock(self):
+    """
+    Allow assignment for the duration of the call. Freezable objects are
+    thawed, Lockable ones bump the unlock depth.
+    """
+    cls = type(self)
+    if getattr(cls, '_earthdragon_freezable', False):
+        thawed = cls.__dict__.get('_earthdragon_thawed')
+        if thawed is None:
+            # already thawed, the outermost call refreezes
+            yield
+            return
+        object.__setattr__(self, '__class__', thawed)
+        try:
+            yield
+        finally:
+            object.__setattr__(self, '__class__', cls)
+        return
 
-    @first
-    @only_self
-    def unlock(self):
-        self._in_flight += 1
+    key = id(self)
+    _unlocked[key] = _unlocked.get(key, 0) + 1
+    try:
         yield
-        self._in_flight -= 1
+    finally:
+        depth = _unlocked[key] - 1
+        if depth:
+            _unlocked[key] = depth
+        else:
+            del _unlocked[key]
+
+
+class Lockable:
+    """
+    Only allow attribute assignment during __init__ and @mutate methods.
+
+    The unlock depth is kept in _unlocked rather than on the instance, so
+    the check in __setattr__ is a dict lookup rather than a hook call and
+    attribute reads cost the same as on a plain object.
+    """
+    unlock = unlock
 
     __init__ = Attr()
     __init__.add_hook(unlock)
 
+    def __setattr__(self, name, value):
+        if id(self) not in _unlocked:
+            raise UnexpectedMutationError(name)
+        super().__setattr__(name, value)
 
-    @first
-    @require_self
-    def _lock_check(self, name, value): # replicate setattr signature
-        if name in ['_in_flight']:
-            return
 
-        if self._in_flight <= 0:
-            raise UnexpectedMutationError(name)
+def _frozen_setattr(self, name, value):
+    raise UnexpectedMutationError(name)
+
+
+def _frozen_delattr(self, name):
+    raise UnexpectedMutationError(name)
+
+
+def _frozen_reduce(self):
+    return _refreeze, (type(self)._earthdragon_thawed, self.__dict__.copy())
+
+
+def _refreeze(cls, state):
+    obj = cls.__new__(cls)
+    obj.__dict__.update(state)
+    object.__setattr__(obj, '__class__', frozen_class(cls))
+    return obj
+
+
+def frozen_class(cls):
+    """
+    Subclass of cls that only overrides __setattr__/__delattr__ to raise.
+    Created on first use and cached on cls.
+    """
+    try:
+        return cls.__dict__['_earthdragon_frozen_class']
+    except KeyError:
+        pass
+
+    dct = {
+        # same layout as cls, so instances can switch __class__
+        '__slots__': (),
+        '__module__': cls.__module__,
+        '__qualname__': cls.__qualname__,
+        '__doc__': cls.__doc__,
+        '__setattr__': _frozen_setattr,
+        '__delattr__': _frozen_delattr,
+        '__reduce__': _frozen_reduce,
+        '_earthdragon_thawed': cls,
+    }
+    # skip the metaclass __new__, there's nothing new to build
+    frozen = type.__new__(type(cls), cls.__name__, (cls,), dct)
+    type.__setattr__(cls, '_earthdragon_frozen_class', frozen)
+    return frozen
+
+
+class Freezable:
+    """
+    Alternative to Lockable where the object's class is swapped to a
+    frozen_class subclass once __init__ finishes, and back for the
+    duration of a @mutate call.
+
+    Assignment while thawed doesn't touch any lock code, so it suits
+    objects that set many attributes per @mutate call. The cost moves to
+    the __class__ swaps, and swapping __class__ materialises the instance
+    __dict__, which makes attribute reads about 3x slower than on a plain
+    object or a Lockable one. Prefer Lockable for objects that are read
+    far more often than mutated. isinstance works as usual, but type(obj)
+    of a frozen object is the frozen subclass.
+    """
+    _earthdragon_freezable = True
+
+    @first
+    @only_self
+    def _freeze(self):
+        # first, so the freeze happens after every other __init__ hook
         yield
+        cls = type(self)
+        if '_earthdragon_thawed' not in cls.__dict__:
+            object.__setattr__(self, '__class__', frozen_class(cls))
+
+    __init__ = Attr()
+    __init__.add_hook(_freeze)
 
-    __setattr__ = Attr()
-    __setattr__.add_hook(_lock_check)
 
 mutate = MultiDecorator()
-mutate.add_hook(Lockable.unlock)
+mutate.add_hook(unlock)
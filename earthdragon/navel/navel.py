@@ -1,5 +1,5 @@
 from ..feature import FeatureBase, features, FeatureMeta
-from .lockable import Lockable
+from .lockable import Lockable, Freezable
 from ..typelet import Typelet, gather_typelets, typelet_repr
 
 class NavelMeta(FeatureMeta):
@@ -9,3 +9,9 @@ class NavelMeta(FeatureMeta):
 @features(Lockable)
 class Navel(FeatureBase, metaclass=FeatureMeta):
     pass
+
+
+@features(Freezable)
+class FrozenNavel(FeatureBase, metaclass=FeatureMeta):
+    """ Navel that is frozen after __init__ instead of checked per setattr """
+    pass
@@ -1,7 +1,8 @@
 import pytest
 
-from ..navel import Navel, NavelMeta
+from ..navel import Navel, NavelMeta, FrozenNavel
 from ...feature import Attr
+from .. import lockable
 from ..lockable import UnexpectedMutationError, mutate
 from earthdragon.typelet import TypeletMeta, Int
 
@@ -48,6 +49,117 @@ def test_navel_lockable():
     assert hk.x == 50
 
 
+def test_lockable_depth():
+    class Hippo(Navel):
+        def __init__(self, x):
+            self.x = x
+
+        @mutate
+        def outer(self, x):
+            self.inner(x)
+            self.x += 1
+
+        @mutate
+        def inner(self, x):
+            self.x = x
+
+    hip = Hippo(1)
+    # locked again once __init__ returns
+    assert id(hip) not in lockable._unlocked
+
+    hip.outer(10)
+    assert hip.x == 11
+    assert id(hip) not in lockable._unlocked
+
+    with pytest.raises(UnexpectedMutationError):
+        hip.x = 1
+    assert hip.x == 11
+    # nothing stored on the instance
+    assert vars(hip) == {'x': 11}
+
+    class Failing(Hippo):
+        @mutate
+        def fail(self):
+            self.x = -1
+            raise ValueError()
+
+    hip = Failing(1)
+    try:
+        hip.fail()
+    except ValueError:
+        assert id(hip) not in lockable._unlocked
+        with pytest.raises(UnexpectedMutationError):
+            hip.x = 99
+    assert hip.x == -1
+
+
+class FrozenHippo(FrozenNavel):
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    @mutate
+    def outer(self, x):
+        self.inner(x)
+        self.x += 1
+
+    @mutate
+    def inner(self, x):
+        self.x = x
+
+    @mutate
+    def fail(self):
+        self.x = -1
+        raise ValueError()
+
+
+def test_frozen_navel():
+    import copy
+    import pickle
+
+    hip = FrozenHippo(3, 10)
+    assert isinstance(hip, FrozenHippo)
+    assert type(hip) is not FrozenHippo
+    assert hip.x == 3
+
+    with pytest.raises(UnexpectedMutationError):
+        hip.x = 30
+    with pytest.raises(UnexpectedMutationError):
+        del hip.x
+    assert hip.x == 3
+
+    hip.outer(10)
+    assert hip.x == 11
+    assert type(hip) is not FrozenHippo
+    with pytest.raises(UnexpectedMutationError):
+        hip.x = 30
+
+    # refrozen even when the mutate fails, while the traceback is alive
+    try:
+        hip.fail()
+    except ValueError:
+        with pytest.raises(UnexpectedMutationError):
+            hip.x = 30
+    assert hip.x == -1
+
+    for other in [copy.copy(hip), pickle.loads(pickle.dumps(hip))]:
+        assert type(other) is type(hip)
+        assert other.__dict__ == hip.__dict__
+        with pytest.raises(UnexpectedMutationError):
+            other.x = 30
+
+    class HippoKid(FrozenHippo):
+        def __init__(self, x, y):
+            super().__init__(x, y)
+            self.z = x + y
+
+    hk = HippoKid(1, 2)
+    assert hk.z == 3
+    assert isinstance(hk, HippoKid)
+    with pytest.raises(UnexpectedMutationError):
+        hk.z = 1
+
+
 def test_nested_lockable():
 
     class Parent(Navel):
@@ -101,3 +213,25 @@ def test_multiple_meta():
         pass
 
     h = HippoChild(1, 2)  # noqa: F841
+
+
+def test_multiple_meta_frozen_navel():
+    class TestMultiMeta(NavelMeta, TypeletMeta):
+        pass
+
+    class Hippo(FrozenNavel, metaclass=TestMultiMeta):
+        x = Int()
+
+        def __init__(self, x):
+            self.x = x
+
+    h = Hippo(1)
+    with pytest.raises(UnexpectedMutationError):
+        h.x = 2
+
+    # the cached frozen class isn't mistaken for a frozen typelet class
+    class HippoChild(Hippo):
+        def __init__(self, x):
+            super().__init__(x)
+
+    assert HippoChild(3).x == 3
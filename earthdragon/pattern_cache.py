@@ -0,0 +1,120 @@
+"""
+On disk cache for compiled @pattern functions.
+
+Building a pattern means parsing the function source, walking the cases and
+compiling the generated matcher. We store the resulting code object in
+__pycache__ next to the module, keyed by a hash of the function source and
+the interpreter cache tag, so later imports skip straight to instantiating
+the code.
+
+EARTHDRAGON_PATTERN_CACHE:
+    '0' disables the cache. Any other value is used as the cache directory
+    instead of the module's __pycache__.
+"""
+import hashlib
+import inspect
+import marshal
+import os
+import sys
+import tempfile
+
+# bump when the generated code or payload layout changes.
+CACHE_VERSION = 3
+
+ENV_VAR = 'EARTHDRAGON_PATTERN_CACHE'
+
+
+def enabled():
+    return os.environ.get(ENV_VAR) != '0'
+
+
+def cache_path(func):
+    """
+    /pkg/__pycache__/module.func_qualname.cpython-311.pattern
+    """
+    filename = func.__code__.co_filename
+    if not os.path.isfile(filename):
+        return None
+
+    tag = sys.implementation.cache_tag
+    if tag is None:
+        return None
+
+    directory, base = os.path.split(filename)
+    stem = os.path.splitext(base)[0]
+    qualname = func.__qualname__.replace('<', '').replace('>', '')
+    cache_name = f'{stem}.{qualname}.{tag}.pattern'
+
+    cache_dir = os.environ.get(ENV_VAR) or os.path.join(directory, '__pycache__')
+    return os.path.join(cache_dir, cache_name)
+
+
+def source_hash(func):
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        return None
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def load(func):
+    """
+    Return the cached payload for func or None if missing or stale.
+    """
+    if not enabled():
+        return None
+
+    path = cache_path(func)
+    if path is None:
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    try:
+        version, digest, payload = marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        return None
+
+    if version != CACHE_VERSION or digest != source_hash(func):
+        return None
+    return payload
+
+
+def store(func, payload):
+    """
+    Write payload for func. Failures are ignored, the cache is only an
+    optimization. Like .pyc files, nothing is written when
+    sys.dont_write_bytecode is set.
+    """
+    if not enabled() or sys.dont_write_bytecode:
+        return False
+
+    path = cache_path(func)
+    digest = source_hash(func)
+    if path is None or digest is None:
+        return False
+
+    try:
+        data = marshal.dumps((CACHE_VERSION, digest, payload))
+    except ValueError:
+        # payload contains something marshal can't handle.
+        return False
+
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        return False
+    return True
@@ -1,27 +1,96 @@
 import ast
+from collections import Counter
+from collections.abc import Mapping, Sequence
 import copy
+import functools
+import numbers
+import os
+import types
+import weakref
 
 from asttools import func_code, Matcher, unwrap
-from asttools.function import create_function
 
-from .func_util import get_invoked_args, get_argspec
+from . import pattern_cache
+from .func_util import get_argspec
 from .typelet import List, Type
 
 
+class _Substitute(ast.NodeTransformer):
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def visit_Name(self, node):
+        return self.nodes.get(node.id, node)
+
+
+def expr(template, **nodes):
+    """
+    Parse an expression template and swap in ast nodes by name.
+
+    expr('isinstance(s, t)', s=subject, t=ref)
+    """
+    node = ast.parse(template, mode='eval').body
+    return _Substitute(nodes).visit(node)
+
+
 class Pattern:
+    # guard expression. ast node that gets inlined into the generated func.
     when = None
+    # name the pattern object was resolved from in the function's scope.
+    origin = None
 
     def __init__(self, **kwargs):
         for k, v in kwargs.items():
             setattr(self, k, v)
 
-    def _match(self, obj, args, kwargs):
-        if not self.match(obj):
-            return False
-        if self.when:
-            ret = self.when(*args, **kwargs)
-            return ret
-        return True
+    def compile(self, subject, bind):
+        """
+        Return an ast expression that tests `subject`.
+
+        subject : ast.expr
+            The match variable(s). A Tuple node when matching on multiple
+            variables.
+        bind : callable
+            bind(obj, origin=None) -> ast.Name. Makes obj available to the
+            generated function as a closure variable. origin is the name obj
+            was resolved from, which lets cached code re-resolve it.
+        """
+        raise NotImplementedError
+
+    def match_many(self, values):
+        """
+        Vectorized match. values is a 1d ndarray, returns a bool ndarray.
+
+        Non object arrays are matched as the python scalars .tolist()
+        produces. The default loops over match(), patterns override this
+        where numpy can do the comparison.
+        """
+        import numpy as np
+        items = values.tolist()
+        return np.fromiter(map(self.match, items), dtype=bool, count=len(items))
+
+
+def _numeric(values):
+    return values.dtype.kind in 'biuf'
+
+
+def _item(node, key):
+    """ ast for node[key] """
+    return ast.Subscript(
+        value=node,
+        slice=ast.Constant(value=key),
+        ctx=ast.Load(),
+    )
+
+
+def _value_node(value, origin, bind):
+    """
+    Literals are inlined. A value that came from a name is bound so cached
+    code picks up the name's current value.
+    """
+    if origin is None:
+        return ast.Constant(value=value)
+    return bind(value, origin)
 
 
 _default = object()
@@ -31,6 +100,13 @@ class DefaultPattern(Pattern):
     def match(self, obj):
         return True
 
+    def compile(self, subject, bind):
+        return ast.Constant(value=True)
+
+    def match_many(self, values):
+        import numpy as np
+        return np.ones(len(values), dtype=bool)
+
 
 class InstancePattern(Pattern):
     _type = Type(type)
@@ -41,6 +117,18 @@ class InstancePattern(Pattern):
     def match(self, obj):
         return isinstance(obj, self._type)
 
+    def compile(self, subject, bind):
+        t = bind(self._type, self.origin)
+        return expr('isinstance(s, t)', s=subject, t=t)
+
+    def match_many(self, values):
+        import numpy as np
+        if values.dtype == object or len(values) == 0:
+            return super().match_many(values)
+        # every element of a typed array converts to the same python type.
+        matched = isinstance(values[:1].tolist()[0], self._type)
+        return np.full(len(values), matched, dtype=bool)
+
 
 class ScalarPattern(Pattern):
     def __init__(self, value):
@@ -51,6 +139,26 @@ class ScalarPattern(Pattern):
             return False
         return obj == self.value
 
+    def compile(self, subject, bind):
+        return expr(
+            'isinstance(s, t) and s == v',
+            s=subject,
+            t=bind(_scalar_types),
+            v=_value_node(self.value, self.origin, bind),
+        )
+
+    def match_many(self, values):
+        import numpy as np
+        kind = values.dtype.kind
+        if kind in 'biu' and isinstance(self.value, int):
+            return values == self.value
+        if kind == 'U' and isinstance(self.value, str):
+            return values == self.value
+        if kind in 'biufU':
+            # typed array that can't hold self.value's type
+            return np.zeros(len(values), dtype=bool)
+        return super().match_many(values)
+
 
 class ValuePattern(Pattern):
     def __init__(self, value):
@@ -59,6 +167,9 @@ class ValuePattern(Pattern):
     def match(self, obj):
         return obj == self.value
 
+    def compile(self, subject, bind):
+        return expr('s == v', s=subject, v=bind(self.value, self.origin))
+
 
 class IdentityPattern(Pattern):
     def __init__(self, value):
@@ -67,6 +178,18 @@ class IdentityPattern(Pattern):
     def match(self, obj):
         return obj is self.value
 
+    def compile(self, subject, bind):
+        v = _value_node(self.value, self.origin, bind)
+        return expr('s is v', s=subject, v=v)
+
+    def match_many(self, values):
+        import numpy as np
+        if values.dtype.kind == 'b' and self.value is not None:
+            return values == self.value
+        if _numeric(values):
+            return np.zeros(len(values), dtype=bool)
+        return super().match_many(values)
+
 
 class MultiPattern(Pattern):
     patterns = List(Pattern)
@@ -76,12 +199,141 @@ class MultiPattern(Pattern):
         tests = zip(self.patterns, obj)
         return all([p.match(o) for p, o in tests])
 
+    def compile(self, subject, bind):
+        if not isinstance(subject, ast.Tuple):
+            raise TypeError("MultiPattern requires multiple match variables")
+        if len(subject.elts) != len(self.patterns):
+            raise TypeError(
+                f"Pattern has {len(self.patterns)} parts but matching on "
+                f"{len(subject.elts)} variables"
+            )
+        tests = [
+            p.compile(s, bind) for p, s in zip(self.patterns, subject.elts)
+        ]
+        return ast.BoolOp(op=ast.And(), values=tests)
+
+
+class SequencePattern(Pattern):
+    """
+    [int, str] or (int, str). Matches a non-string sequence of the same
+    length whose items match element-wise.
+    """
+    patterns = List(Pattern)
+
+    def match(self, obj):
+        if not isinstance(obj, Sequence) or isinstance(obj, _text_types):
+            return False
+        if len(obj) != len(self.patterns):
+            return False
+        return all(p.match(o) for p, o in zip(self.patterns, obj))
+
+    def compile(self, subject, bind):
+        tests = [
+            expr(
+                'isinstance(s, seq) and not isinstance(s, text)',
+                s=subject,
+                seq=bind(Sequence),
+                text=bind(_text_types),
+            ),
+            expr('len(s) == n', s=subject, n=ast.Constant(len(self.patterns))),
+        ]
+        for i, p in enumerate(self.patterns):
+            tests.append(p.compile(_item(subject, i), bind))
+        return ast.BoolOp(op=ast.And(), values=tests)
+
+
+class MappingPattern(Pattern):
+    """
+    {'key': int}. Matches a mapping that has every key, where each value
+    matches its pattern. Extra keys are ignored.
+    """
+    def __init__(self, patterns):
+        self.patterns = patterns
+
+    def match(self, obj):
+        if not isinstance(obj, Mapping):
+            return False
+        for key, p in self.patterns.items():
+            if key not in obj or not p.match(obj[key]):
+                return False
+        return True
+
+    def compile(self, subject, bind):
+        tests = [expr('isinstance(s, m)', s=subject, m=bind(Mapping))]
+        for key, p in self.patterns.items():
+            k = ast.Constant(value=key)
+            tests.append(expr('k in s', k=k, s=subject))
+            tests.append(p.compile(_item(subject, key), bind))
+        return ast.BoolOp(op=ast.And(), values=tests)
+
+
+class RangePattern(Pattern):
+    """
+    range(start, stop). Matches numbers equal to an integer i where
+    start <= i < stop, so 3 and 3.0 match range(0, 10) but 3.5 doesn't,
+    the same as `in range(start, stop)` for real numbers.
+    """
+    def __init__(self, start, stop):
+        self.start = start
+        self.stop = stop
+
+    def match(self, obj):
+        if not isinstance(obj, numbers.Real):
+            return False
+        if not self.start <= obj < self.stop:
+            return False
+        return isinstance(obj, numbers.Integral) or obj == int(obj)
+
+    def compile(self, subject, bind):
+        # the bounds check first, int() can't take nan or inf
+        return expr(
+            'isinstance(s, real) and start <= s < stop'
+            ' and (isinstance(s, integral) or s == int(s))',
+            s=subject,
+            real=bind(numbers.Real),
+            integral=bind(numbers.Integral),
+            start=ast.Constant(value=self.start),
+            stop=ast.Constant(value=self.stop),
+        )
+
+    def match_many(self, values):
+        import numpy as np
+        kind = values.dtype.kind
+        if kind in 'biuf':
+            matched = (values >= self.start) & (values < self.stop)
+            if kind == 'f':
+                matched &= values == np.floor(values)
+            return matched
+        return super().match_many(values)
+
 
 class UnhandledPatternError(Exception):
     pass
 
 
+_scalar_types = (int, str)
+_text_types = (str, bytes, bytearray)
+# marks a shared guard that hasn't been evaluated yet in the current call.
+_unset = object()
+
+# objects the generated code binds that do not come from the function scope.
+_internals = {
+    'scalar_types': _scalar_types,
+    'text_types': _text_types,
+    'mapping': Mapping,
+    'sequence': Sequence,
+    'integral': numbers.Integral,
+    'real': numbers.Real,
+    'unset': _unset,
+    'unhandled': UnhandledPatternError,
+}
+
+
 class PatternMatcher:
+    """
+    Holds the cases of a pattern function. The cases are compiled into a
+    single function by PatternBuilder, which is stored as `func`.
+    """
     match = List(str)
     patterns = List(Pattern)
 
@@ -90,23 +342,130 @@ class PatternMatcher:
         self.match = match
         self.meta = meta
         self.patterns = []
-        self.funcs = {}
+        self.returns = {}
+        self.func = None
+        # compiled guard/return funcs for match_many keyed by ast dump.
+        self._single_var_funcs = {}
 
-    def add_pattern(self, pattern, func):
+    def add_pattern(self, pattern, expression):
         self.patterns.append(pattern)
-        self.funcs[pattern] = func
+        self.returns[pattern] = expression
 
-    def __call__(self, *args, **kwargs):
-        invoked = get_invoked_args(self.argspec, *args, **kwargs)
-        mvars = [invoked[name] for name in self.match]
-        if len(mvars) == 1:
-            mvars = mvars[0]
+    def subject(self):
+        names = [ast.Name(id=name, ctx=ast.Load()) for name in self.match]
+        if len(names) == 1:
+            return names[0]
+        return ast.Tuple(elts=names, ctx=ast.Load())
 
-        for pattern in self.patterns:
-            if pattern._match(mvars, args, kwargs):
-                func = self.funcs[pattern]
-                return func(*args, **kwargs)
-        raise UnhandledPatternError("Not handled by PatternMatcher")
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def _single_var_func(self, node):
+        """
+        Compile node into a function of the match variable only. Used to
+        evaluate guards and returns per element in match_many.
+        """
+        key = ast.dump(node)
+        func = self._single_var_funcs.get(key)
+        if func is None:
+            func = self._compile_single_var(node)
+            self._single_var_funcs[key] = func
+        return func
+
+    def _compile_single_var(self, node):
+        if len(self.match) != 1:
+            raise TypeError("match_many requires a single match variable")
+        name = self.match[0]
+        others = set(self.argspec.args + self.argspec.kwonlyargs) - {name}
+        used = {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+        if used & others:
+            raise TypeError(
+                f"match_many can't evaluate {ast.unparse(node)!r}, "
+                f"it uses arguments other than {name!r}"
+            )
+        lambda_node = ast.Lambda(
+            args=ast.arguments(
+                posonlyargs=[], args=[ast.arg(arg=name)], vararg=None,
+                kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[],
+            ),
+            body=node,
+        )
+        code = compile(
+            ast.fix_missing_locations(ast.Expression(body=lambda_node)),
+            f'<pattern {self.func.__qualname__}>',
+            'eval',
+        )
+        return eval(code, self.func.__globals__)
+
+    def match_many(self, values):
+        """
+        Classify every value in one pass per case. values can be a list,
+        ndarray or Series.
+
+        Returns an int ndarray of case indexes into self.patterns with -1
+        where no case matched. Cases without guards on numeric arrays are
+        done as numpy comparisons. Guards are evaluated per element, only
+        for values the case matched.
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            if e.name != 'numpy':
+                raise
+            raise ImportError("match_many requires numpy") from e
+        if len(self.match) != 1:
+            raise TypeError("match_many requires a single match variable")
+
+        values = _as_array(values)
+        result = np.full(len(values), -1, dtype=np.intp)
+        remaining = np.arange(len(values))
+        for i, p in enumerate(self.patterns):
+            if len(remaining) == 0:
+                break
+
+            mask = np.asarray(p.match_many(values[remaining]), dtype=bool)
+            if p.when is not None and mask.any():
+                guard = self._single_var_func(p.when)
+                candidates = values[remaining[mask]].tolist()
+                mask[mask] = [bool(guard(v)) for v in candidates]
+
+            result[remaining[mask]] = i
+            remaining = remaining[~mask]
+        return result
+
+    def dispatch_many(self, values):
+        """
+        Run every value through the matcher, grouped by case. Returns a
+        list of results in the order of values.
+        """
+        import numpy as np
+        values = _as_array(values)
+        cases = self.match_many(values)
+        if (cases == -1).any():
+            bad = values[cases == -1][:1].tolist()[0]
+            raise UnhandledPatternError(
+                f"Not handled by PatternMatcher: {bad!r}"
+            )
+
+        results = [None] * len(values)
+        for i in np.unique(cases):
+            func = self._single_var_func(self.returns[self.patterns[i]])
+            idx = np.flatnonzero(cases == i)
+            for j, v in zip(idx.tolist(), values[idx].tolist()):
+                results[j] = func(v)
+        return results
+
+
+def _as_array(values):
+    import numpy as np
+    if isinstance(values, np.ndarray):
+        return values
+    if hasattr(values, '__array__'):
+        # pandas Series/Index
+        return np.asarray(values)
+    # keep lists as objects. np.asarray([1, 'a']) would make strings.
+    values = list(values)
+    return np.fromiter(values, dtype=object, count=len(values))
 
 
 def config_from_subscript(sub):
@@ -194,9 +553,152 @@ def pattern_split(lines):
     return lines[i], lines[i+1:]
 
 
-def pattern(func):
+EAGER_ENV_VAR = 'EARTHDRAGON_PATTERN_EAGER'
+
+
+def pattern(func=None, *, eager=None):
+    """
+    Decorate a pattern function.
+
+    By default this returns a LazyPattern stub that builds the matcher on
+    first call. Pass eager=True, or set EARTHDRAGON_PATTERN_EAGER=1, to
+    build at decoration time.
+
+    @pattern
+    def lazy(x): ...
+
+    @pattern(eager=True)
+    def eager(x): ...
+    """
+    if func is None:
+        return functools.partial(pattern, eager=eager)
+
+    if eager is None:
+        eager = os.environ.get(EAGER_ENV_VAR, '0') != '0'
+
+    if eager:
+        return build(func)
+    return LazyPattern(func)
+
+
+def build(func):
+    new_func = load_cached(func)
+    if new_func is not None:
+        return new_func
+
     builder = PatternBuilder(func)
-    return builder.build()
+    pt = builder.build()
+    return pt.func
+
+
+# LazyPatterns that have not been built yet.
+_pending = weakref.WeakSet()
+
+
+def warmup():
+    """
+    Build every pattern that is still waiting on its first call. Meant for
+    production startup where we'd rather pay the cost up front.
+    """
+    for stub in list(_pending):
+        stub.build()
+
+
+class LazyPattern:
+    """
+    Stand in for a @pattern function that defers PatternBuilder.build until
+    the first call.
+
+    Once built, the stub rebinds the defining module's global to the built
+    function if it still points at the stub, so module level patterns lose
+    the forwarding call. Other references keep working through the stub.
+    """
+    def __init__(self, func):
+        self.func = None
+        functools.update_wrapper(self, func)
+        _pending.add(self)
+
+    def build(self):
+        if self.func is None:
+            orig_func = self.__wrapped__
+            self.func = build(orig_func)
+            _pending.discard(self)
+
+            scope = orig_func.__globals__
+            name = orig_func.__name__
+            if scope.get(name) is self:
+                scope[name] = self.func
+        return self.func
+
+    def __call__(self, *args, **kwargs):
+        func = self.func
+        if func is None:
+            func = self.build()
+        return func(*args, **kwargs)
+
+    # act like a function
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        return types.MethodType(self, obj)
+
+    def __repr__(self):
+        state = 'built' if self.func is not None else 'pending'
+        return f"<LazyPattern {self.__qualname__} ({state})>"
+
+
+def get_matcher(func):
+    """
+    Return the PatternMatcher for a @pattern function. Functions loaded from
+    the pattern cache are rebuilt from source on first request.
+    """
+    if isinstance(func, LazyPattern):
+        func = func.build()
+
+    matcher = getattr(func, 'matcher', None)
+    if matcher is None:
+        matcher = PatternBuilder(func.__wrapped__).build()
+        func.matcher = matcher
+    return matcher
+
+
+def load_cached(func):
+    payload = pattern_cache.load(func)
+    if payload is None:
+        return None
+
+    code, specs = payload
+    scope = func.__globals__
+    bound = []
+    for kind, name, pattern_kind in specs:
+        if kind == 'internal':
+            bound.append(_internals[name])
+            continue
+
+        try:
+            obj = resolve_name(scope, name)
+        except AttributeError:
+            return None
+        # the name must resolve to the same kind of pattern it was built with.
+        # i.e. a class that has since been rebound to a str.
+        if type(build_pattern(obj)).__name__ != pattern_kind:
+            return None
+        bound.append(obj)
+
+    return instantiate(code, bound, func)
+
+
+def instantiate(code, bound, func):
+    """
+    Run the generated factory code and dress the result up as func.
+    """
+    ns = {}
+    exec(code, func.__globals__, ns)
+    new_func = ns['__pattern_factory__'](*bound)
+    functools.update_wrapper(new_func, func)
+    new_func.__defaults__ = func.__defaults__
+    new_func.__kwdefaults__ = func.__kwdefaults__
+    return new_func
 
 
 def resolve_name(scope, name):
@@ -292,9 +794,14 @@ class PatternBuilder:
 
         pt = PatternMatcher(argspec, meta['match'], meta)
         for line in cases:
-            pattern, new_func = self.process_case(line, func)
-            pt.add_pattern(pattern, new_func)
-
+            pattern, expression = self.process_case(line)
+            pt.add_pattern(pattern, expression)
+
+        code, bound, specs = self.compile(pt)
+        pt.func = instantiate(code, bound, func)
+        pt.func.matcher = pt
+        if specs is not None:
+            pattern_cache.store(func, (code, specs))
         return pt
 
     def process_pattern(self, pnode):
@@ -309,10 +816,12 @@ class PatternBuilder:
         pval = unwrap(pnode)
         scope = self.scope
         if pval == 'default':
-            obj = _default
-        else:
-            obj = resolve_name(scope, pval)
-        return build_pattern(obj)
+            return build_pattern(_default)
+
+        obj = resolve_name(scope, pval)
+        pattern = build_pattern(obj)
+        pattern.origin = pval
+        return pattern
 
     def process_pattern_NameConstant(self, pnode):
         return build_pattern(pnode.value)
@@ -331,10 +840,34 @@ class PatternBuilder:
         b = config_from_subscript(pnode)
         when = b.get('when')
         if when:
-            when_func = self._return_from_template(when[0])
-            pattern.when = when_func
+            pattern.when = when[0]
         return pattern
 
+    def process_pattern_List(self, pnode):
+        patterns = [self.process_pattern(node) for node in pnode.elts]
+        return SequencePattern(patterns=patterns)
+
+    def process_pattern_Tuple(self, pnode):
+        # a nested tuple. top level tuples are split into a MultiPattern
+        # before they get here.
+        return self.process_pattern_List(pnode)
+
+    def process_pattern_Dict(self, pnode):
+        patterns = {}
+        for key, value in zip(pnode.keys, pnode.values):
+            if not isinstance(key, ast.Constant):
+                raise TypeError("Mapping pattern keys must be constants")
+            patterns[key.value] = self.process_pattern(value)
+        return MappingPattern(patterns)
+
+    def process_pattern_Call(self, pnode):
+        if unwrap(pnode.func) != 'range':
+            raise TypeError("Only range() calls are supported in patterns")
+        bounds = [ast.literal_eval(arg) for arg in pnode.args]
+        if len(bounds) != 2:
+            raise TypeError("range patterns take start and stop")
+        return RangePattern(*bounds)
+
     def process_pattern_list(self, pnode):
         patterns = []
         for node in pnode:
@@ -343,23 +876,170 @@ class PatternBuilder:
 
         return MultiPattern(patterns=patterns)
 
-    def process_case(self, line, func):
+    def process_case(self, line):
         pattern_case, pattern_return = split_case(line)
         pattern = self.process_pattern(pattern_case)
-        new_func = self._return_from_template(pattern_return)
-
-        return pattern, new_func
-
-    def _return_from_template(self, expression):
-        new_func_def = copy.deepcopy(self.func_def)
-        ret = ast.Return(value=expression, lineno=1, col_offset=0)
-        new_func_def.body = [ret]
-        new_func = create_function(
-            new_func_def,
-            self.func,
-            ignore_closure=True
+        return pattern, pattern_return
+
+    def _signature(self):
+        """
+        Copy of the original arguments with defaults and annotations stripped.
+        Defaults are carried over from the original function object so they
+        are not re-evaluated.
+        """
+        args = copy.deepcopy(self.func_def.args)
+        args.defaults = []
+        args.kw_defaults = [None] * len(args.kwonlyargs)
+        all_args = [
+            *getattr(args, 'posonlyargs', []),
+            *args.args,
+            *args.kwonlyargs,
+            args.vararg,
+            args.kwarg,
+        ]
+        for arg in filter(None, all_args):
+            arg.annotation = None
+        return args
+
+    def compile(self, pt):
+        """
+        Generate a single function that inlines every case as a branch:
+
+        def __pattern_factory__(__pattern_0, ...):
+            def func(<original args>):
+                if isinstance(x, __pattern_0) and <when>:
+                    return <case return>
+                ...
+                raise __pattern_n("Not handled by PatternMatcher")
+            return func
+
+        Match variables are the function's own arguments, so binding is
+        done by the interpreter and each call is a single frame.
+
+        Returns the code for the factory module, the objects to pass to
+        the factory and the specs describing where those objects came from.
+        specs is None when an object can't be re-resolved, which means the
+        code can't be cached.
+        """
+        bound = []
+        specs = []
+        internal_ids = {id(v): k for k, v in _internals.items()}
+
+        def bind(obj, origin=None):
+            name = f'__pattern_{len(bound)}'
+            bound.append(obj)
+            if origin is not None:
+                pattern_kind = type(build_pattern(obj)).__name__
+                specs.append(('name', origin, pattern_kind))
+            elif id(obj) in internal_ids:
+                specs.append(('internal', internal_ids[id(obj)], None))
+            else:
+                specs.append(None)
+            return ast.Name(id=name, ctx=ast.Load())
+
+        subject = pt.subject()
+        guard = GuardMemo([p.when for p in pt.patterns], bind(_unset))
+        body = []
+        for p in pt.patterns:
+            test = p.compile(subject, bind)
+            if p.when is not None:
+                test = ast.BoolOp(op=ast.And(), values=[test, guard(p.when)])
+            ret = ast.Return(value=pt.returns[p])
+            body.append(ast.If(test=test, body=[ret], orelse=[]))
+        body = guard.setup() + body
+
+        unhandled = expr(
+            'err("Not handled by PatternMatcher")',
+            err=bind(UnhandledPatternError),
         )
-        return new_func
+        body.append(ast.Raise(exc=unhandled, cause=None))
+
+        func_def = ast.FunctionDef(
+            name=self.func_def.name,
+            args=self._signature(),
+            body=body,
+            decorator_list=[],
+            returns=None,
+        )
+        factory_args = [ast.arg(arg=f'__pattern_{i}') for i in range(len(bound))]
+        factory = ast.FunctionDef(
+            name='__pattern_factory__',
+            args=ast.arguments(
+                posonlyargs=[], args=factory_args, vararg=None,
+                kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[],
+            ),
+            body=[
+                func_def,
+                ast.Return(value=ast.Name(id=func_def.name, ctx=ast.Load())),
+            ],
+            decorator_list=[],
+            returns=None,
+        )
+        module = ast.fix_missing_locations(
+            ast.Module(body=[factory], type_ignores=[])
+        )
+        filename = f'<pattern {self.func.__qualname__}>'
+        code = compile(module, filename, 'exec')
+
+        if None in specs:
+            specs = None
+        return code, bound, specs
+
+
+def _trivial(node):
+    """
+    Expressions that are cheaper to re-evaluate than to memoize.
+    """
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        node = node.operand
+    return isinstance(node, (ast.Name, ast.Constant))
+
+
+class GuardMemo:
+    """
+    Common subexpression sharing for guards. When several cases guard on
+    the same expression, the first evaluation is stored in a local and the
+    other cases reuse it:
+
+        __guard_0 = __unset
+        if isinstance(x, int) and (__guard_0 if __guard_0 is not __unset
+                                   else (__guard_0 := x.is_ready())):
+            ...
+        if isinstance(x, float) and (<same>):
+            ...
+
+    Guards are still evaluated lazily, only once a case's pattern matched.
+    """
+    def __init__(self, guards, unset):
+        counts = Counter(ast.dump(g) for g in guards if g is not None)
+        self.shared = {k for k, n in counts.items() if n > 1}
+        self.unset = unset
+        self.names = {}
+
+    def __call__(self, node):
+        key = ast.dump(node)
+        if key not in self.shared or _trivial(node):
+            return node
+
+        name = self.names.get(key)
+        if name is None:
+            name = f'__guard_{len(self.names)}'
+            self.names[key] = name
+        return expr(
+            f'{name} if {name} is not unset else ({name} := e)',
+            unset=self.unset,
+            e=node,
+        )
+
+    def setup(self):
+        """ statements that reset the memo slots at the top of the func """
+        return [
+            ast.Assign(
+                targets=[ast.Name(id=name, ctx=ast.Store())],
+                value=self.unset,
+            )
+            for name in self.names.values()
+        ]
 
 
 def build_pattern(obj):
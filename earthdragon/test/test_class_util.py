@@ -4,6 +4,8 @@ from ..class_util import (
     get_unbounded_super,
     set_class_attr,
     class_attrs,
+    mro_lookup,
+    get_bindable,
 )
 
 
@@ -113,3 +115,64 @@ def test_class_attrs():
         whee = 2
 
     attrs = class_attrs(Frank)  # noqa: F841
+    assert attrs['whee']['defining_class'] is Frank
+    assert attrs['dale']['defining_class'] is Bob
+    assert attrs['dale']['kind'] == 'data'
+    assert '__init__' not in attrs
+
+
+def test_class_attrs_kinds():
+    class Base:
+        def meth(self):
+            pass
+
+        @classmethod
+        def cmeth(cls):
+            pass
+
+        @staticmethod
+        def smeth():
+            pass
+
+        @property
+        def prop(self):
+            pass
+
+    class Child(Base):
+        def meth(self):
+            pass
+
+    attrs = class_attrs(Child)
+    assert attrs['meth']['kind'] == 'method'
+    assert attrs['meth']['defining_class'] is Child
+    assert attrs['meth']['object'] is Child.__dict__['meth']
+    assert attrs['cmeth']['kind'] == 'class method'
+    assert attrs['smeth']['kind'] == 'static method'
+    assert attrs['prop']['kind'] == 'property'
+
+    assert mro_lookup(Child, 'meth') is Child.__dict__['meth']
+    assert mro_lookup(Child, 'cmeth') is Base.__dict__['cmeth']
+    assert mro_lookup(Child, '__init__') is None
+    assert mro_lookup(Child, 'missing', 1) == 1
+
+
+def test_get_bindable_keeps_closure():
+    offset = 10
+
+    class Base:
+        def hello(self, x=1, *, y=2):
+            return x + y + offset
+
+    class Mixin:
+        def hello(self, x=1, *, y=2):
+            return super().hello(x, y=y) + offset
+
+    class Target(Base):
+        pass
+
+    func = get_bindable(Mixin.__dict__['hello'], Target)
+    assert func is not Mixin.__dict__['hello']
+    assert func.__qualname__ == Mixin.hello.__qualname__
+    Target.hello = func
+    assert Target().hello() == 23
+    assert Target().hello(2, y=3) == 25
@@ -1,6 +1,6 @@
 import pytest
 
-from ..meta import MetaMeta, mro
+from ..meta import MetaMeta, MetaDict, metadict_class, mro
 
 
 def middle_matcher(start, end):
@@ -73,6 +73,30 @@ class DummyClass2(metaclass=DummyMeta2):
     dale = 1
 
 
+def test_prepare_plain_dict():
+    class PlainMeta(MetaMeta):
+        def __new__(cls, name, bases, dct, **kwargs):
+            cls.namespace = dct
+            return super().__new__(cls, name, bases, dct)
+
+    class Plain(metaclass=PlainMeta, extra=True):
+        dale = 1
+
+    assert type(PlainMeta.namespace) is dict
+    assert Plain.dale == 1
+
+
+def test_prepare_handler_class_cached():
+    ns = DummyMeta2.__prepare__('Dummy', ())
+    assert isinstance(ns, MetaDict)
+    assert type(ns) is metadict_class(DummyMeta2.setitem_handler)
+    assert type(DummyMeta2.__prepare__('Other', ())) is type(ns)
+
+    ns['set_bob_to'] = 'whee'
+    ns['dale'] = 1
+    assert dict(ns) == {'bob': 'whee', 'dale': 1}
+
+
 def test_mro():
     class MROMeta(type):
         def __new__(cls, name, bases, dct):
@@ -156,6 +156,27 @@ def test_decorator_update_duplicate():
         new_dec.update(func_dec)
 
 
+def test_decorator_update_copy_on_write():
+    def other_hook(*args):
+        yield
+
+    parent = MultiDecorator()
+    parent.add_hook(some_hook)
+    parent.add_pipeline(add_1)
+
+    child = MultiDecorator.combine(parent)
+    # nothing to add, so the lists are shared
+    assert child.hooks is parent.hooks
+
+    child.add_hook(other_hook)
+    assert child.hooks == [some_hook, other_hook]
+    assert parent.hooks == [some_hook]
+
+    parent.add_pipeline(add_2)
+    assert parent.pipelines == [add_1, add_2]
+    assert child.pipelines == [add_1]
+
+
 def test_decorator_send_ret():
     """
     The yield for a hook will return the function/pipeline return
@@ -7,6 +7,8 @@ from asttools import (
 
 from ..pattern_match import (
     pattern,
+    LazyPattern,
+    warmup,
     UnhandledPatternError,
     config_from_subscript,
     split_case_return
@@ -150,3 +152,226 @@ def test_pattern_match_object():
 
     assert multimatch(1, _missing) == (1, "MISSING")
     assert multimatch(_missing, 100) == (_missing, 100)
+
+
+def test_pattern_compiles_to_function():
+    import types
+
+    @pattern(eager=True)
+    def compiled(x, y=10, *, z=1):
+        meta[match: x]  # noqa: F821
+
+        ~ int [when: x > y] | x + z  # noqa: F821, E211
+        ~ default | y  # noqa: F821
+
+    # whole match is a single generated function, not a dispatcher object
+    assert isinstance(compiled, types.FunctionType)
+    assert compiled.__name__ == 'compiled'
+    assert len(compiled.matcher.patterns) == 2
+    assert compiled(11) == 12
+    assert compiled(11, z=5) == 16
+    assert compiled(1) == 10
+    assert compiled(1, 0) == 2
+
+
+def _cached_pattern(x):
+    meta[match: x]  # noqa: F821
+
+    ~ Hello | x.greeting
+    ~ int | x + 1
+    ~ default | x  # noqa: F821
+
+
+def test_pattern_cache(tmp_path, monkeypatch):
+    from .. import pattern_cache
+    from ..pattern_match import get_matcher
+
+    import sys
+    monkeypatch.setattr(sys, 'dont_write_bytecode', False)
+    monkeypatch.setenv(pattern_cache.ENV_VAR, str(tmp_path))
+
+    built = pattern(_cached_pattern, eager=True)
+    assert 'matcher' in built.__dict__
+    assert list(tmp_path.iterdir())
+
+    cached = pattern(_cached_pattern, eager=True)
+    # loaded from disk, the matcher was never built
+    assert 'matcher' not in cached.__dict__
+    assert cached(Hello('hi')) == 'hi'
+    assert cached(1) == 2
+    assert cached('x') == 'x'
+    assert len(get_matcher(cached).patterns) == 3
+
+    monkeypatch.setenv(pattern_cache.ENV_VAR, '0')
+    assert pattern_cache.load(_cached_pattern) is None
+
+
+TARGET = 'a'
+NOTHING = None
+
+
+def _constant_pattern(x):
+    meta[match: x]  # noqa: F821
+
+    ~ TARGET | 'hit'
+    ~ NOTHING | 'nothing'
+    ~ default | 'miss'  # noqa: F821
+
+
+def test_pattern_cache_constants(tmp_path, monkeypatch):
+    """ module constants are re-resolved when loading from the cache """
+    from .. import pattern_cache
+    import sys
+    monkeypatch.setattr(sys, 'dont_write_bytecode', False)
+    monkeypatch.setenv(pattern_cache.ENV_VAR, str(tmp_path))
+
+    built = pattern(_constant_pattern, eager=True)
+    assert built('a') == 'hit'
+    assert built(None) == 'nothing'
+    assert pattern_cache.load(_constant_pattern) is not None
+
+    module = sys.modules[__name__]
+    monkeypatch.setattr(module, 'TARGET', 'b')
+    cached = pattern(_constant_pattern, eager=True)
+    assert 'matcher' not in cached.__dict__
+    assert cached('b') == 'hit'
+    assert cached('a') == 'miss'
+    assert cached(None) == 'nothing'
+
+
+def test_lazy_pattern(monkeypatch):
+    @pattern
+    def lazy(x):
+        meta[match: x]  # noqa: F821
+
+        ~ int | 'int'
+        ~ LateDefined | 'late'  # noqa: F821
+
+    # nothing is resolved until the first call
+    assert isinstance(lazy, LazyPattern)
+    assert lazy.func is None
+
+    LateDefined = type('LateDefined', (), {})
+    monkeypatch.setitem(globals(), 'LateDefined', LateDefined)
+    assert lazy(LateDefined()) == 'late'
+    assert lazy(1) == 'int'
+    assert lazy.func is not None
+
+    @pattern
+    def warm(x):
+        meta[match: x]  # noqa: F821
+
+        ~ int | 'int'
+        ~ default | 'other'  # noqa: F821
+
+    warmup()
+    assert warm.func is not None
+    assert warm(1) == 'int'
+    assert warm('1') == 'other'
+
+
+def test_structural_patterns():
+    @pattern
+    def shape(x):
+        meta[match: x]  # noqa: F821
+
+        ~ {'type': 'point', 'x': int} | ('point', x['x'])
+        ~ {'type': str} | x['type']
+        ~ [int, int] | 'pair'
+        ~ (str, (int, int)) | 'named pair'
+        ~ range(0, 10) | 'small'
+        ~ default | 'other'  # noqa: F821
+
+    assert shape({'type': 'point', 'x': 3}) == ('point', 3)
+    assert shape({'type': 'point', 'x': 'bad'}) == 'point'
+    assert shape({'type': 'line', 'extra': 1}) == 'line'
+    assert shape([1, 2]) == 'pair'
+    assert shape((1, 2)) == 'pair'
+    assert shape([1, 2, 3]) == 'other'
+    assert shape(('a', (1, 2))) == 'named pair'
+    assert shape('ab') == 'other'
+    assert shape(3) == 'small'
+    assert shape(True) == 'small'
+    # same as `in range(0, 10)`
+    assert shape(3.0) == 'small'
+    assert shape(9.5) == 'other'
+    assert shape(float('nan')) == 'other'
+    assert shape(float('inf')) == 'other'
+    assert shape(10) == 'other'
+    assert shape(10.0) == 'other'
+
+
+def test_match_many():
+    np = pytest.importorskip('numpy')
+    from ..pattern_match import get_matcher
+
+    @pattern
+    def route(x):
+        meta[match: x]  # noqa: F821
+
+        ~ 0 | 'zero'
+        ~ range(1, 10) | 'small'
+        ~ int [when: x % 2 == 0] | 'even'  # noqa: F821, E211
+        ~ float | 'float'
+
+    matcher = get_matcher(route)
+
+    values = np.arange(13)
+    cases = matcher.match_many(values)
+    expected = [
+        0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, -1, 2
+    ]
+    assert cases.tolist() == expected
+
+    # object arrays go through the python match
+    cases = matcher.match_many([0, 'a', 2.5, 12.0, 20])
+    assert cases.tolist() == [0, -1, 3, 3, 2]
+
+    # floats equal to an int in range match, like the python match
+    floats = [0.0, 2.0, 2.5, 12.0, float('nan'), float('inf')]
+    cases = matcher.match_many(np.array(floats))
+    assert cases.tolist() == [3, 1, 3, 3, 3, 3]
+    assert cases.tolist() == matcher.match_many(floats + ['a'])[:-1].tolist()
+
+    assert matcher.dispatch_many([0, 5, 12, 11.5]) == [
+        'zero', 'small', 'even', 'float'
+    ]
+    with pytest.raises(UnhandledPatternError):
+        matcher.dispatch_many([11])
+
+    # matches the scalar call for every value
+    values = [0, 3, 10, 12, 1.5, 10.5]
+    assert matcher.dispatch_many(values) == [route(v) for v in values]
+
+
+CHECKS = []
+
+
+def _expensive_check(x):
+    CHECKS.append(x)
+    return x > 5
+
+
+def test_shared_guard():
+    @pattern
+    def shared(x):
+        meta[match: x]  # noqa: F821
+
+        ~ bool [when: _expensive_check(x)] | 'bool'  # noqa: F821, E211
+        ~ int [when: _expensive_check(x)] | 'big'  # noqa: F821, E211
+        ~ int | 'small'
+
+    CHECKS.clear()
+    assert shared(True) == 'small'
+    # both guarded cases matched on pattern, the guard ran once
+    assert CHECKS == [True]
+
+    CHECKS.clear()
+    assert shared(10) == 'big'
+    assert CHECKS == [10]
+
+    # memo is per call
+    CHECKS.clear()
+    assert shared(1) == 'small'
+    assert shared(1) == 'small'
+    assert CHECKS == [1, 1]
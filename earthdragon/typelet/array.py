@@ -0,0 +1,170 @@
+"""
+Typelets for numpy arrays and pandas objects. Not imported by
+earthdragon.typelet, import earthdragon.typelet.array directly. pandas is
+only imported once a Series or DataFrame typelet is created.
+
+Validation only looks at metadata (type, dtype, ndim, shape, columns) so the
+cost doesn't grow with the number of elements. NumericList is the numeric
+counterpart to List; it stores a 1d ndarray instead of checking every item
+of a python list.
+"""
+import numpy as np
+
+from .typelet import Typelet, TypeletError
+
+__all__ = ['Array', 'NumericList', 'Series', 'DataFrame', 'dtype_matches']
+
+
+def dtype_matches(dtype, spec):
+    """
+    spec can be anything np.issubdtype takes, so abstract types like
+    np.integer or np.floating match every concrete dtype below them.
+    pandas extension dtypes ('category', etc) fall back to equality.
+    """
+    if spec is None:
+        return True
+    try:
+        return np.issubdtype(dtype, spec)
+    except TypeError:
+        return dtype == spec
+
+
+def _pandas(name):
+    try:
+        import pandas
+    except ImportError as e:
+        if e.name != 'pandas':
+            raise
+        raise ImportError(
+            "{name} typelet requires pandas".format(name=name)) from e
+    return pandas
+
+
+def shape_matches(shape, spec):
+    """ spec is a tuple where None matches any length along that axis """
+    if spec is None:
+        return True
+    if len(shape) != len(spec):
+        return False
+    return all(want is None or want == got for got, want in zip(shape, spec))
+
+
+class Array(Typelet):
+    check_class = np.ndarray
+
+    def __init__(self, dtype=None, ndim=None, shape=None, **kwargs):
+        if shape is not None:
+            shape = tuple(shape)
+            if ndim is not None and ndim != len(shape):
+                raise ValueError("ndim and shape disagree")
+            ndim = len(shape)
+        self.dtype = dtype
+        self.ndim = ndim
+        self.shape = shape
+        super().__init__(**kwargs)
+
+    def validate(self, value):
+        if not isinstance(value, self.check_class):
+            self.error(value)
+        self._check_meta(value)
+        return value
+
+    def _check_meta(self, value):
+        if not dtype_matches(value.dtype, self.dtype):
+            raise TypeletError(
+                "{name} requires dtype {dtype}. Got {got}".format(
+                    name=type(self).__name__, dtype=self.dtype, got=value.dtype
+                )
+            )
+
+        if self.ndim is not None and value.ndim != self.ndim:
+            raise TypeletError(
+                "{name} requires ndim {ndim}. Got {got}".format(
+                    name=type(self).__name__, ndim=self.ndim, got=value.ndim
+                )
+            )
+
+        if not shape_matches(value.shape, self.shape):
+            raise TypeletError(
+                "{name} requires shape {shape}. Got {got}".format(
+                    name=type(self).__name__, shape=self.shape, got=value.shape
+                )
+            )
+
+
+class NumericList(Array):
+    """
+    List of numbers stored as a 1d ndarray of a concrete dtype.
+
+    Lists and tuples are converted with np.asarray so the per element work
+    happens in C. The conversion has to be lossless, [1, 2.5] is rejected
+    by NumericList(int) the same way List(int) would.
+    """
+    def __init__(self, dtype=float, **kwargs):
+        super().__init__(dtype=np.dtype(dtype), ndim=1, **kwargs)
+
+    def validate(self, value):
+        if isinstance(value, (list, tuple)):
+            value = self._convert(value)
+        return super().validate(value)
+
+    def _convert(self, value):
+        dtype = self.dtype
+        if not value:
+            return np.empty(0, dtype=dtype)
+
+        try:
+            arr = np.asarray(value)
+        except ValueError:
+            # ragged nested sequences
+            self.error(value)
+
+        if arr.dtype.kind not in 'biuf' \
+                or not np.can_cast(arr.dtype, dtype, casting='safe'):
+            raise TypeletError(
+                "NumericList can only contain {dtype}. Got {got}".format(
+                    dtype=dtype, got=arr.dtype
+                )
+            )
+        return arr.astype(dtype, copy=False)
+
+
+class Series(Array):
+    def __init__(self, dtype=None, **kwargs):
+        self.check_class = _pandas('Series').Series
+        super().__init__(dtype=dtype, **kwargs)
+
+
+class DataFrame(Typelet):
+    """
+    columns: column labels that have to exist.
+    dtypes: {column: dtype spec}. Listed columns also have to exist.
+    """
+    def __init__(self, columns=None, dtypes=None, **kwargs):
+        self.check_class = _pandas('DataFrame').DataFrame
+        self.columns = list(columns or [])
+        self.dtypes = dict(dtypes or {})
+        super().__init__(**kwargs)
+
+    def validate(self, value):
+        if not isinstance(value, self.check_class):
+            self.error(value)
+
+        columns = value.columns
+        required = self.columns + [
+            col for col in self.dtypes if col not in self.columns
+        ]
+        missing = [col for col in required if col not in columns]
+        if missing:
+            raise TypeletError(
+                "DataFrame missing columns {missing}".format(missing=missing)
+            )
+
+        for col, spec in self.dtypes.items():
+            dtype = value[col].dtype
+            if not dtype_matches(dtype, spec):
+                raise TypeletError(
+                    "DataFrame column {col} requires dtype {spec}. "
+                    "Got {got}".format(col=col, spec=spec, got=dtype)
+                )
+        return value
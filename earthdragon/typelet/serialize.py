@@ -0,0 +1,365 @@
+"""
+Compact binary encoding for Typelet classes.
+
+The layout comes from _earthdragon_merged_typelets, so nothing about the
+class or field names is written:
+
+    presence bitmap   1 bit per typelet, set when the object has a value
+    fallback bitmap   1 bit per typelet, set when the value was pickled
+    values            present values in typelet order
+
+Int, Float, Bool, Datetime and UUID values are struct packed, Unicode is
+length prefixed utf-8, Type/List/Dict of those are encoded recursively.
+A value the fixed codec can't represent (an int past 64 bits, a tz aware
+datetime, a subclass instance) is pickled instead and flagged in the
+fallback bitmap.
+
+Decoding stores values without running validation. Frozen classes are
+interned as usual. The format is tied to
+the class definition, it's meant for passing objects between processes
+running the same code, not for long term storage. Like pickle, only load
+data you trust.
+"""
+import datetime
+import pickle
+import struct
+import sys
+import uuid
+import weakref
+
+from .typelet import (
+    Int,
+    Float,
+    Bool,
+    Unicode,
+    UUID,
+    Datetime,
+    Type,
+    List,
+    Dict,
+)
+from .util import blank, intern
+
+__all__ = ['dumps', 'loads', 'typelet_reduce', 'SerializationError']
+
+
+class SerializationError(Exception):
+    pass
+
+
+class _Fallback(Exception):
+    """ value doesn't fit the fixed codec """
+
+
+_LEN = struct.Struct('<I')
+
+
+class StructCodec:
+    def __init__(self, fmt, type_):
+        self.struct = struct.Struct('<' + fmt)
+        self.type = type_
+
+    def encode(self, value, out):
+        if type(value) is not self.type:
+            raise _Fallback
+        try:
+            out += self.struct.pack(value)
+        except struct.error:
+            raise _Fallback
+
+    def decode(self, buf, offset):
+        value, = self.struct.unpack_from(buf, offset)
+        return value, offset + self.struct.size
+
+
+class UnicodeCodec:
+    def encode(self, value, out):
+        if type(value) is not str:
+            raise _Fallback
+        data = value.encode('utf-8', 'surrogatepass')
+        out += _LEN.pack(len(data))
+        out += data
+
+    def decode(self, buf, offset):
+        size, = _LEN.unpack_from(buf, offset)
+        offset += _LEN.size
+        data = bytes(buf[offset:offset+size])
+        return data.decode('utf-8', 'surrogatepass'), offset + size
+
+
+class UUIDCodec:
+    def encode(self, value, out):
+        if type(value) is not uuid.UUID:
+            raise _Fallback
+        out += value.bytes
+
+    def decode(self, buf, offset):
+        return uuid.UUID(bytes=bytes(buf[offset:offset+16])), offset + 16
+
+
+class DatetimeCodec:
+    """ naive datetimes as microseconds since datetime.min """
+    epoch = datetime.datetime.min
+    micro = datetime.timedelta(microseconds=1)
+    struct = struct.Struct('<q')
+
+    def encode(self, value, out):
+        if type(value) is not datetime.datetime or value.tzinfo is not None:
+            raise _Fallback
+        out += self.struct.pack((value - self.epoch) // self.micro)
+
+    def decode(self, buf, offset):
+        value, = self.struct.unpack_from(buf, offset)
+        value = self.epoch + datetime.timedelta(microseconds=value)
+        return value, offset + self.struct.size
+
+
+class PickleCodec:
+    def encode(self, value, out):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        out += _LEN.pack(len(data))
+        out += data
+
+    def decode(self, buf, offset):
+        size, = _LEN.unpack_from(buf, offset)
+        offset += _LEN.size
+        return pickle.loads(buf[offset:offset+size]), offset + size
+
+
+class NestedCodec:
+    """ typelet object of exactly cls """
+    def __init__(self, cls):
+        self.cls = cls
+
+    def encode(self, value, out):
+        if type(value) is not self.cls:
+            raise _Fallback
+        _encode(value, out)
+
+    def decode(self, buf, offset):
+        return _decode(self.cls, buf, offset)
+
+
+class ListCodec:
+    def __init__(self, item_codec, typelet):
+        self.item_codec = item_codec
+        self.typelet = typelet
+
+    def encode(self, value, out):
+        if not isinstance(value, list):
+            raise _Fallback
+        out += _LEN.pack(len(value))
+        encode = self.item_codec.encode
+        for item in value:
+            encode(item, out)
+
+    def decode(self, buf, offset):
+        size, = _LEN.unpack_from(buf, offset)
+        offset += _LEN.size
+        decode = self.item_codec.decode
+        items = []
+        for _ in range(size):
+            item, offset = decode(buf, offset)
+            items.append(item)
+        return self.typelet.wrap(items), offset
+
+
+class DictCodec:
+    def __init__(self, key_codec, value_codec, typelet):
+        self.key_codec = key_codec
+        self.value_codec = value_codec
+        self.typelet = typelet
+
+    def encode(self, value, out):
+        if not isinstance(value, dict):
+            raise _Fallback
+        out += _LEN.pack(len(value))
+        encode_key = self.key_codec.encode
+        encode_value = self.value_codec.encode
+        for k, v in value.items():
+            encode_key(k, out)
+            encode_value(v, out)
+
+    def decode(self, buf, offset):
+        size, = _LEN.unpack_from(buf, offset)
+        offset += _LEN.size
+        decode_key = self.key_codec.decode
+        decode_value = self.value_codec.decode
+        items = {}
+        for _ in range(size):
+            k, offset = decode_key(buf, offset)
+            v, offset = decode_value(buf, offset)
+            items[k] = v
+        return self.typelet.wrap(items), offset
+
+
+INT = StructCodec('q', int)
+FLOAT = StructCodec('d', float)
+BOOL = StructCodec('?', bool)
+UNICODE = UnicodeCodec()
+UUID_CODEC = UUIDCodec()
+DATETIME = DatetimeCodec()
+PICKLE = PickleCodec()
+
+_class_codecs = {
+    int: INT,
+    float: FLOAT,
+    bool: BOOL,
+    str: UNICODE,
+    uuid.UUID: UUID_CODEC,
+    datetime.datetime: DATETIME,
+}
+
+
+def class_codec(cls):
+    """ codec for values that are instances of cls """
+    if cls is None:
+        return PICKLE
+    if cls in _class_codecs:
+        return _class_codecs[cls]
+    if '_earthdragon_merged_typelets' in getattr(cls, '__dict__', {}):
+        return NestedCodec(cls)
+    return PICKLE
+
+
+def check_class(cls, typelet):
+    """
+    typelet.check_class, resolving a class named by string the way
+    validation would for an instance of cls. Validation fills in
+    check_class lazily, so the layout can't depend on whether it has run.
+    """
+    check_class = typelet.check_class
+    if check_class is not None:
+        return check_class
+    class_name = getattr(typelet, '_class', None)
+    if not isinstance(class_name, str):
+        return None
+    module = sys.modules.get(cls.__module__)
+    return getattr(module, class_name, None)
+
+
+def typelet_codec(cls, typelet):
+    if isinstance(typelet, Int):
+        return INT
+    if isinstance(typelet, Float):
+        return FLOAT
+    if isinstance(typelet, Bool):
+        return BOOL
+    if isinstance(typelet, Unicode):
+        return UNICODE
+    if isinstance(typelet, UUID):
+        return UUID_CODEC
+    if isinstance(typelet, Datetime):
+        return DATETIME
+    if isinstance(typelet, Type):
+        return class_codec(typelet.check_class)
+    if isinstance(typelet, Dict):
+        return DictCodec(
+            class_codec(typelet.key_class),
+            class_codec(check_class(cls, typelet)),
+            typelet,
+        )
+    if isinstance(typelet, List):
+        return ListCodec(class_codec(check_class(cls, typelet)), typelet)
+    return PICKLE
+
+
+_layouts = weakref.WeakKeyDictionary()
+
+
+def layout(cls):
+    """
+    [(name, typelet, codec)] for cls in _earthdragon_merged_typelets order.
+    Collections that refer to their class by name are resolved through
+    cls's module, so the layout is the same whether or not anything has
+    been validated yet.
+    """
+    try:
+        return _layouts[cls]
+    except KeyError:
+        pass
+
+    fields = [
+        (name, typelet, typelet_codec(cls, typelet))
+        for name, typelet in cls._earthdragon_merged_typelets.items()
+    ]
+    _layouts[cls] = fields
+    return fields
+
+
+def _encode(obj, out):
+    fields = layout(type(obj))
+    nbytes = (len(fields) + 7) // 8
+    head = len(out)
+    out += bytes(2 * nbytes)
+
+    present = 0
+    fallback = 0
+    for i, (name, typelet, codec) in enumerate(fields):
+        try:
+            value = typelet._load(obj)
+        except AttributeError:
+            continue
+        present |= 1 << i
+
+        start = len(out)
+        try:
+            codec.encode(value, out)
+        except _Fallback:
+            del out[start:]
+            fallback |= 1 << i
+            PICKLE.encode(value, out)
+
+    out[head:head+nbytes] = present.to_bytes(nbytes, 'little')
+    out[head+nbytes:head+2*nbytes] = fallback.to_bytes(nbytes, 'little')
+
+
+def _decode(cls, buf, offset):
+    fields = layout(cls)
+    nbytes = (len(fields) + 7) // 8
+    present = int.from_bytes(buf[offset:offset+nbytes], 'little')
+    offset += nbytes
+    fallback = int.from_bytes(buf[offset:offset+nbytes], 'little')
+    offset += nbytes
+
+    obj = blank(cls)
+    for i, (name, typelet, codec) in enumerate(fields):
+        if not present >> i & 1:
+            continue
+        if fallback >> i & 1:
+            value, offset = PICKLE.decode(buf, offset)
+        else:
+            value, offset = codec.decode(buf, offset)
+        typelet._store(obj, value)
+    return intern(obj), offset
+
+
+def dumps(obj):
+    """ encode a typelet object. Values left at their default are skipped """
+    out = bytearray()
+    _encode(obj, out)
+    return bytes(out)
+
+
+def loads(cls, data):
+    """ decode data written by dumps for an instance of cls """
+    buf = memoryview(data)
+    try:
+        obj, offset = _decode(cls, buf, 0)
+    except struct.error as e:
+        raise SerializationError("Truncated data for {cls}".format(
+            cls=cls.__name__)) from e
+    if offset != len(buf):
+        raise SerializationError("Trailing data for {cls}".format(
+            cls=cls.__name__))
+    return obj
+
+
+def typelet_reduce(self):
+    """
+    __reduce__ that pickles through dumps/loads.
+
+    class Record(metaclass=TypeletMeta):
+        __reduce__ = typelet_reduce
+    """
+    return loads, (type(self), dumps(self))
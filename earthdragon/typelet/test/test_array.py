@@ -0,0 +1,83 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from ..typelet import TypeletError
+from ..util import TypeletMeta
+from ..array import Array, NumericList, Series, DataFrame
+
+
+class Arrays(metaclass=TypeletMeta):
+    any_arr = Array()
+    floats = Array(dtype=np.floating)
+    matrix = Array(dtype='f8', shape=(None, 3))
+    nums = NumericList(int)
+
+
+def test_array():
+    obj = Arrays()
+    arr = np.arange(10)
+    obj.any_arr = arr
+    assert obj.any_arr is arr
+
+    obj.floats = np.zeros(3, dtype='f4')
+    obj.floats = np.zeros(3, dtype='f8')
+    with pytest.raises(TypeletError):
+        obj.floats = np.zeros(3, dtype=int)
+
+    with pytest.raises(TypeletError):
+        obj.any_arr = [1, 2, 3]
+
+    obj.matrix = np.zeros((5, 3))
+    with pytest.raises(TypeletError):
+        obj.matrix = np.zeros((5, 4))
+    with pytest.raises(TypeletError):
+        obj.matrix = np.zeros(3)
+
+    with pytest.raises(ValueError):
+        Array(ndim=1, shape=(1, 2))
+
+
+def test_numeric_list():
+    obj = Arrays()
+    obj.nums = [1, 2, 3]
+    assert isinstance(obj.nums, np.ndarray)
+    assert obj.nums.dtype == np.dtype(int)
+    assert obj.nums.tolist() == [1, 2, 3]
+
+    obj.nums = []
+    assert len(obj.nums) == 0
+
+    arr = np.arange(5)
+    obj.nums = arr
+    assert obj.nums is arr
+
+    for bad in [[1, 2.5], ['a'], [object()], np.zeros(3), np.zeros((2, 2))]:
+        with pytest.raises(TypeletError):
+            obj.nums = bad
+
+
+def test_pandas():
+    pd = pytest.importorskip('pandas')
+
+    class Frames(metaclass=TypeletMeta):
+        s = Series(dtype=np.number)
+        cat = Series(dtype='category')
+        df = DataFrame(columns=['a'], dtypes={'b': np.floating})
+
+    obj = Frames()
+    obj.s = pd.Series([1, 2])
+    with pytest.raises(TypeletError):
+        obj.s = pd.Series(['a'])
+    with pytest.raises(TypeletError):
+        obj.s = np.arange(2)
+
+    obj.cat = pd.Series(['a'], dtype='category')
+    with pytest.raises(TypeletError):
+        obj.cat = pd.Series([1])
+
+    obj.df = pd.DataFrame({'a': [1], 'b': [1.5]})
+    with pytest.raises(TypeletError):
+        obj.df = pd.DataFrame({'a': [1], 'b': [1]})
+    with pytest.raises(TypeletError):
+        obj.df = pd.DataFrame({'b': [1.5]})
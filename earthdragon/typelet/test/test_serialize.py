@@ -0,0 +1,145 @@
+import datetime
+import pickle
+import uuid
+
+import pytest
+
+from ..typelet import (
+    Int,
+    Float,
+    Bool,
+    Unicode,
+    UUID,
+    Datetime,
+    Type,
+    List,
+    Dict,
+    TypedList,
+    TypedDict,
+    TypeletError,
+)
+from ..util import TypeletMeta
+from ..serialize import dumps, loads, typelet_reduce, SerializationError
+
+
+class Point(metaclass=TypeletMeta, init=True, slots=True):
+    x = Int()
+    y = Int()
+
+
+class Record(metaclass=TypeletMeta, init=True):
+    i = Int()
+    f = Float()
+    b = Bool()
+    s = Unicode()
+    u = UUID()
+    d = Datetime()
+    point = Type(Point)
+    points = List(Point)
+    names = List(str)
+    scores = Dict(float, key_class=str)
+    flag = Int(default=5)
+
+    __reduce__ = typelet_reduce
+
+
+class Node(metaclass=TypeletMeta, init=True):
+    name = Unicode()
+    children = List('Node')
+
+
+def values(obj):
+    return {
+        name: getattr(obj, name)
+        for name in type(obj)._earthdragon_merged_typelets
+    }
+
+
+def make_record():
+    return Record(
+        i=-3,
+        f=1.5,
+        b=True,
+        s='héllo',
+        u=uuid.uuid4(),
+        d=datetime.datetime(2020, 1, 2, 3, 4, 5, 6),
+        point=Point(1, 2),
+        points=[Point(3, 4), Point(y=5)],
+        names=['a', 'b'],
+        scores={'a': 1.0},
+    )
+
+
+def test_round_trip():
+    rec = make_record()
+    data = dumps(rec)
+    new = loads(Record, data)
+
+    assert type(new) is Record
+    got = values(new)
+    want = values(rec)
+    for name in ['point', 'points']:
+        got[name] = values(got[name]) if name == 'point' \
+            else [values(p) for p in got[name]]
+        want[name] = values(want[name]) if name == 'point' \
+            else [values(p) for p in want[name]]
+    assert got == want
+
+    # default isn't stored
+    assert 'flag' not in new.__dict__
+    assert new.flag == 5
+
+    # containers come back the same way validation stores them
+    assert type(new.names) is TypedList
+    assert type(new.scores) is TypedDict
+    with pytest.raises(TypeletError):
+        new.names.append(1)
+
+    assert len(data) < len(pickle.dumps(rec.__dict__))
+
+
+def test_fallback():
+    rec = Record(
+        i=2**70,
+        f=3,
+        d=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+        names=['a'],
+    )
+    new = loads(Record, dumps(rec))
+    assert new.i == 2**70
+    assert new.f == 3 and type(new.f) is int
+    assert new.d == rec.d
+    assert new.names == ['a']
+
+
+def test_pickle():
+    rec = make_record()
+    new = pickle.loads(pickle.dumps(rec))
+    assert new.u == rec.u
+    assert new.points[1].y == 5
+
+
+def test_bad_data():
+    data = dumps(make_record())
+    with pytest.raises(SerializationError):
+        loads(Record, data[:-1])
+    with pytest.raises(SerializationError):
+        loads(Record, data + b'\x00')
+
+
+def test_class_named_by_string(monkeypatch):
+    from .. import serialize
+
+    # producer has validated, so children's check_class is resolved
+    tree = Node(name='root', children=[Node(name='leaf')])
+    assert Node.children.check_class is Node
+    data = dumps(tree)
+
+    # consumer that only ever calls loads
+    monkeypatch.setattr(Node.children, 'check_class', None)
+    serialize._layouts.clear()
+
+    new = loads(Node, data)
+    assert new.name == 'root'
+    assert [child.name for child in new.children] == ['leaf']
+    assert dumps(new) == data
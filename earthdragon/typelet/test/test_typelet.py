@@ -8,8 +8,13 @@ from ..typelet import (
         Dict,
         TypeletError,
         KeyTypeError,
+        TypedList,
+        skip_validation,
         Float,
         Unicode,
+        UUID,
+        Datetime,
+        Bool,
         _missing
 )
 from .. import util
@@ -272,3 +277,585 @@ def test_inherited_inflate():
     assert gc.gc_name == 'Dale'
     assert gc.c_id == 123
     assert gc.p_id == -1
+
+
+def test_slots():
+    class SlotPoint(metaclass=TypeletMeta, slots=True):
+        x = Int()
+        y = Int(default=3)
+        name = Unicode()
+
+    p = SlotPoint()
+    assert not hasattr(p, '__dict__')
+    assert p.x is None
+    assert p.y == 3
+
+    p.x = 1
+    p.y = 2
+    assert (p.x, p.y) == (1, 2)
+
+    with pytest.raises(TypeletError):
+        p.x = 'one'
+    assert p.x == 1
+
+    # only typelets have storage
+    with pytest.raises(AttributeError):
+        p.other = 1
+
+    class SlotPoint3(SlotPoint, slots=True):
+        z = Int()
+
+    p3 = SlotPoint3()
+    p3.x = 1
+    p3.z = 3
+    assert not hasattr(p3, '__dict__')
+    assert (p3.x, p3.y, p3.z) == (1, 3, 3)
+    assert 'z' in SlotPoint3._earthdragon_merged_typelets
+
+
+def test_slots_with_dict():
+    class Loose(metaclass=TypeletMeta, slots=True):
+        __slots__ = ('__dict__',)
+        x = Int()
+
+    obj = Loose()
+    obj.x = 1
+    obj.other = 2
+    assert obj.x == 1
+    assert 'x' not in obj.__dict__
+
+
+def test_generated_init():
+    class Base(metaclass=TypeletMeta):
+        id = Int(required=True)
+
+    class Record(Base, init=True):
+        name = Unicode()
+        score = Float(default=0.0)
+        tags = List(str)
+        small = Int(min=0, max=10)
+
+    r = Record(1, 'Dale', tags=['a'])
+    assert r.id == 1
+    assert r.name == 'Dale'
+    assert r.score == 0.0
+    assert r.tags == ['a']
+    assert r.small is None
+
+    with pytest.raises(InvalidInitInvocation, match="All required"):
+        Record(name='Dale')
+
+    with pytest.raises(TypeletError):
+        Record(1.5)
+
+    with pytest.raises(TypeletError):
+        Record(1, small=11)
+
+    with pytest.raises(TypeletError):
+        Record(1, tags=[1])
+
+    with pytest.raises(TypeError):
+        Record(1, bad=1)
+
+    class SlotRecord(metaclass=TypeletMeta, init=True, slots=True):
+        x = Int()
+        y = Int()
+
+    s = SlotRecord(1, y=2)
+    assert (s.x, s.y) == (1, 2)
+
+
+def test_generated_init_respects_override():
+    class Custom(metaclass=TypeletMeta, init=True):
+        x = Int()
+
+        def __init__(self, x):
+            self.x = x * 2
+
+    assert Custom(2).x == 4
+
+    class Even(Int):
+        def validate(self, value):
+            value = super().validate(value)
+            if value % 2:
+                self.error(value)
+            return value
+
+    class EvenRecord(metaclass=TypeletMeta, init=True):
+        x = Even()
+
+    assert EvenRecord(2).x == 2
+    with pytest.raises(TypeletError):
+        EvenRecord(3)
+
+
+def test_generated_code_field_names():
+    """ typelet names don't shadow what the generated code refers to """
+    import datetime
+    import uuid
+
+    names = dict(
+        uuid=UUID(),
+        datetime=Datetime(),
+        self=Int(),
+        type=Unicode(),
+        isinstance=Bool(),
+        validates=Int(),
+    )
+    values = dict(
+        uuid=uuid.uuid4(),
+        datetime=datetime.datetime(2020, 1, 1),
+        self=1,
+        type='a',
+        isinstance=True,
+        validates=2,
+    )
+
+    Record = TypeletMeta('Record', (), dict(names), init=True)
+    r = Record(*values.values())
+    assert {name: getattr(r, name) for name in names} == values
+    with pytest.raises(TypeletError):
+        Record(uuid='a')
+
+    Frozen = TypeletMeta('Frozen', (), dict(names), frozen=True, slots=True)
+    f = Frozen(**values)
+    assert {name: getattr(f, name) for name in names} == values
+    assert Frozen(**values) is f
+    with pytest.raises(TypeletError):
+        Frozen(datetime='a')
+
+    row, = Frozen.from_columns(**{k: [v] for k, v in values.items()})
+    assert row is f
+
+
+def test_typed_collections():
+    obj = ExampleObj()
+    obj.lst = [V(), V()]
+    assert isinstance(obj.lst, TypedList)
+
+    obj.lst.append(V())
+    obj.lst += [V()]
+    obj.lst[0] = V()
+    assert len(obj.lst) == 4
+
+    with pytest.raises(TypeletError):
+        obj.lst.append(1)
+    with pytest.raises(TypeletError):
+        obj.lst.extend([V(), 1])
+    with pytest.raises(TypeletError):
+        obj.lst[1:2] = [1]
+    assert len(obj.lst) == 4
+
+    obj.dct_key = {'a': 1}
+    obj.dct_key['b'] = 2
+    obj.dct_key.update(c=3)
+    assert obj.dct_key == {'a': 1, 'b': 2, 'c': 3}
+
+    with pytest.raises(TypeletError):
+        obj.dct_key['d'] = 'bad'
+    with pytest.raises(KeyTypeError):
+        obj.dct_key[1] = 1
+    with pytest.raises(KeyTypeError):
+        obj.dct_key.update({1: 1})
+
+
+def test_typed_collections_copy_plain_containers():
+    obj = ExampleObj()
+    lst = [V()]
+    obj.lst = lst
+    # stored as a TypedList copy, later changes to lst don't show up
+    assert obj.lst is not lst
+    lst.append(V())
+    assert len(obj.lst) == 1
+
+    dct = {'a': 1}
+    obj.dct_key = dct
+    dct['b'] = 2
+    assert obj.dct_key == {'a': 1}
+
+    # typed containers are stored as is
+    typed = obj.lst
+    obj.lst = typed
+    assert obj.lst is typed
+
+
+def test_typed_collections_no_rescan(monkeypatch):
+    obj = ExampleObj()
+    obj.lst = [V()] * 10
+
+    calls = []
+    check = List._check_collection_values
+    monkeypatch.setattr(
+        List,
+        '_check_collection_values',
+        lambda self, values: calls.append(values) or check(self, values),
+    )
+
+    lst = obj.lst
+    lst.append(V())
+    other = ExampleObj()
+    other.lst = lst
+    assert other.lst is lst
+    assert not calls
+
+    # different check_class still gets validated
+    class Other(metaclass=TypeletMeta):
+        lst = List(int)
+
+    with pytest.raises(TypeletError):
+        Other().lst = lst
+    assert len(calls) == 1
+
+
+def test_skip_validation():
+    class Record(metaclass=TypeletMeta, init=True):
+        x = Int()
+        lst = List(int)
+
+    with pytest.raises(TypeletError):
+        Record('a')
+
+    with skip_validation():
+        r = Record('a', lst=['b'])
+        r.x = 'c'
+    assert r.x == 'c'
+    assert r.lst == ['b']
+
+    # back on after the block
+    with pytest.raises(TypeletError):
+        r.x = 'd'
+
+    class Trusted(Record, validate=False):
+        pass
+
+    t = Trusted()
+    t.x = 'a'
+    assert t.x == 'a'
+
+    class Checked(Trusted, validate=True):
+        pass
+
+    with pytest.raises(TypeletError):
+        Checked().x = 'a'
+
+
+def test_from_columns():
+    class Record(metaclass=TypeletMeta):
+        x = Int(required=True)
+        name = Unicode(default='')
+        small = Int(max=10)
+
+    rows = Record.from_columns(x=[1, 2], name=['a', 'b'])
+    assert [(r.x, r.name, r.small) for r in rows] == [(1, 'a', None), (2, 'b', None)]
+    assert all(type(r) is Record for r in rows)
+
+    with pytest.raises(TypeletError):
+        Record.from_columns(x=[1, 'a'])
+    with pytest.raises(InvalidInitInvocation):
+        Record.from_columns(name=['a'])
+    with pytest.raises(InvalidInitInvocation):
+        Record.from_columns(x=[1], bad=[1])
+    with pytest.raises(InvalidInitInvocation):
+        Record.from_columns(x=[1, 2], name=['a'])
+
+    lazy = Record.from_columns(x=[1, 2, 3], lazy=True)
+    assert len(lazy) == 3
+    assert lazy[-1].x == 3
+    assert [r.x for r in lazy[1:]] == [2, 3]
+    with pytest.raises(IndexError):
+        lazy[3]
+
+    rows = Record.from_records([{'x': 1, 'name': 'a'}, {'x': 2, 'name': 'b'}])
+    assert [(r.x, r.name) for r in rows] == [(1, 'a'), (2, 'b')]
+    rows = Record.from_records([(1, 'a'), (2, 'b')])
+    assert [(r.x, r.name) for r in rows] == [(1, 'a'), (2, 'b')]
+    with pytest.raises(InvalidInitInvocation):
+        Record.from_records([{'x': 1}, {'name': 'b'}])
+
+    class SlotRecord(metaclass=TypeletMeta, slots=True):
+        x = Int()
+        y = Int()
+
+    rows = SlotRecord.from_records([(1, 2), (3, 4)])
+    assert [(r.x, r.y) for r in rows] == [(1, 2), (3, 4)]
+
+
+def test_from_columns_numpy(monkeypatch):
+    np = pytest.importorskip('numpy')
+
+    class Record(metaclass=TypeletMeta):
+        x = Int(max=10)
+        y = Float()
+
+    # dtype matches, so elements aren't validated one by one
+    calls = []
+    validate = Int.validate
+    monkeypatch.setattr(
+        Int, 'validate', lambda self, v: calls.append(v) or validate(self, v)
+    )
+    rows = Record.from_columns(x=np.arange(3), y=np.ones(3))
+    assert not calls
+    assert [(r.x, r.y) for r in rows] == [(0, 1.0), (1, 1.0), (2, 1.0)]
+    assert type(rows[0].x) is int
+
+    # out of range falls back to per element validation
+    with pytest.raises(TypeletError):
+        Record.from_columns(x=np.arange(20))
+
+    with pytest.raises(TypeletError):
+        Record.from_columns(x=np.ones(3))
+
+
+def test_from_columns_pandas_extension_dtypes():
+    import datetime
+
+    pd = pytest.importorskip('pandas')
+
+    class Record(metaclass=TypeletMeta):
+        x = Int()
+        when = Datetime()
+
+    # nullable Int64 has kind 'i' but can hold pd.NA
+    with pytest.raises(TypeletError):
+        Record.from_columns(x=pd.Series([1, None], dtype='Int64'))
+    rows = Record.from_columns(x=pd.Series([1, 2], dtype='Int64'))
+    assert [r.x for r in rows] == [1, 2]
+
+    when = pd.Series(pd.to_datetime(['2020-01-01', '2020-01-02'], utc=True))
+    rows = Record.from_columns(when=when)
+    assert rows[0].when == datetime.datetime(
+        2020, 1, 1, tzinfo=datetime.timezone.utc)
+    assert rows[0].when.tzinfo is not None
+
+
+def test_typelet_resolution_order():
+    class Parent(metaclass=TypeletMeta):
+        x = Int()
+        y = Int()
+
+    class Child(Parent):
+        x = Float()
+        z = Int()
+
+    class GrandChild(Child):
+        w = Int()
+
+    # child overrides keep the parent's position
+    merged = GrandChild._earthdragon_merged_typelets
+    assert list(merged) == ['x', 'y', 'z', 'w']
+    assert merged['x'] is Child.__dict__['x']
+
+    assert Parent._earthdragon_tro == []
+    assert [k for k, _ in Child._earthdragon_tro] == [Parent]
+    assert [k for k, _ in GrandChild._earthdragon_tro] == [Parent, Child]
+
+    class Mixin(metaclass=TypeletMeta):
+        x = Unicode()
+        m = Int()
+
+    class Multi(Child, Mixin):
+        pass
+
+    merged = Multi._earthdragon_merged_typelets
+    assert merged['x'] is Child.__dict__['x']
+    assert set(merged) == {'x', 'y', 'z', 'm'}
+    assert [k for k, _ in Multi._earthdragon_tro] == [Parent, Child, Mixin]
+
+    # diamond. C's override comes before A in the mro
+    class A(metaclass=TypeletMeta):
+        x = Int()
+
+    class B(A):
+        pass
+
+    class C(A):
+        x = Unicode()
+
+    class D(B, C):
+        pass
+
+    merged = D._earthdragon_merged_typelets
+    assert merged['x'] is C.__dict__['x']
+    assert merged['x'] is util.init_typelets(D)['x']
+
+
+def test_typelet_name_set_at_class_creation(monkeypatch):
+    from .. import typelet as typelet_mod
+
+    class Plain:
+        x = Int()
+
+    class Meta(metaclass=TypeletMeta):
+        y = List(int)
+
+    assert Plain.__dict__['x'].name == 'x'
+    assert Meta.__dict__['y'].name == 'y'
+
+    def fail(obj, attr):
+        raise AssertionError("name should already be set")
+    monkeypatch.setattr(typelet_mod, '_get_name', fail)
+
+    p = Plain()
+    p.x = 1
+    assert p.x == 1
+    m = Meta()
+    m.y = [1]
+    assert m.y == [1]
+    monkeypatch.undo()
+
+    # attached after creation still works through the fallback
+    Plain.late = Int()
+    p.late = 2
+    assert p.late == 2
+    assert Plain.__dict__['late'].name == 'late'
+
+
+class FrozenPair(metaclass=TypeletMeta, frozen=True, slots=True):
+    base = Unicode(required=True)
+    quote = Unicode(required=True)
+
+
+class FrozenSize(metaclass=TypeletMeta, frozen=True):
+    size = Float()
+
+
+def test_frozen():
+    import copy
+    import gc
+    import pickle
+
+    p1 = FrozenPair('EUR', 'USD')
+    p2 = FrozenPair(base='EUR', quote='USD')
+    assert p1 is p2
+    assert FrozenPair('EUR', 'GBP') is not p1
+
+    with pytest.raises(util.FrozenInstanceError):
+        p1.base = 'GBP'
+    with pytest.raises(util.FrozenInstanceError):
+        del p1.base
+    with pytest.raises(TypeletError):
+        FrozenPair(1, 'USD')
+    with pytest.raises(InvalidInitInvocation):
+        FrozenPair(quote='USD')
+
+    # types are part of the key
+    assert FrozenSize(1) is not FrozenSize(1.0)
+    assert FrozenSize(1) is FrozenSize(1)
+
+    assert copy.copy(p1) is p1
+    assert copy.deepcopy(p1) is p1
+    assert pickle.loads(pickle.dumps(p1)) is p1
+
+    # interned weakly
+    FrozenPair('AUD', 'NZD')
+    gc.collect()
+    assert len([
+        p for p in FrozenPair._earthdragon_interned.values()
+        if p.base == 'AUD'
+    ]) == 0
+
+    # unhashable values work, they just aren't interned
+    class Tagged(metaclass=TypeletMeta, frozen=True):
+        tags = List(str)
+
+    assert Tagged(['a']) is not Tagged(['a'])
+    assert Tagged(['a']).tags == ['a']
+
+    # subclasses are frozen with their own table
+    class Triple(FrozenPair):
+        third = Unicode()
+
+    t = Triple('EUR', 'USD', 'JPY')
+    assert t is Triple('EUR', 'USD', third='JPY')
+    assert t is not p1
+    with pytest.raises(util.FrozenInstanceError):
+        t.third = 'a'
+
+    with pytest.raises(TypeError):
+        class Bad(metaclass=TypeletMeta, frozen=True):
+            x = Int()
+
+            def __init__(self, x):
+                pass
+
+
+def test_frozen_interned_without_validation():
+    class Small(metaclass=TypeletMeta, frozen=True):
+        n = Int(max=10)
+
+    with skip_validation():
+        unchecked = Small(20)
+    assert unchecked.n == 20
+
+    # a validated call doesn't get the unchecked instance back
+    with pytest.raises(TypeletError):
+        Small(20)
+
+    # valid values interned while validation was off are still shared
+    with skip_validation():
+        small = Small(5)
+    assert Small(5) is small
+    # and known to be valid from then on
+    assert list(Small._earthdragon_unchecked.values()) == [unchecked]
+
+
+def test_frozen_bulk():
+    from ..serialize import dumps, loads
+
+    p = FrozenPair('EUR', 'USD')
+    rows = FrozenPair.from_records([('EUR', 'USD'), ('EUR', 'USD')])
+    assert rows[0] is p and rows[1] is p
+    assert loads(FrozenPair, dumps(p)) is p
+
+    fresh = loads(FrozenPair, dumps(FrozenPair('JPY', 'USD')))
+    assert FrozenPair('JPY', 'USD') is fresh
+
+
+def test_typelet_repr():
+    class Record(metaclass=TypeletMeta):
+        x = Int()
+        name = Unicode()
+        tags = List(int)
+        scores = Dict(int)
+
+        __repr__ = util.typelet_repr
+
+    r = Record()
+    r.x = 1
+    r.name = 'abc'
+    r.tags = [1, 2]
+    r.scores = {'a': 1}
+    assert repr(r) == util.full_repr(r)
+    assert repr(r) == "Record(x=1, name=abc, tags=[1, 2], scores={'a': 1})"
+
+    # dicts keep insertion order, like the untruncated repr
+    r.scores = {'b': 1, 'a': 2}
+    assert repr(r) == util.full_repr(r)
+    assert "scores={'b': 1, 'a': 2}" in repr(r)
+    nested = [{'b': 1, 'a': 2}]
+    assert util.repr_value(nested) == repr(nested)
+
+    r.tags = list(range(100000))
+    r.name = 'a' * 10000
+    r.scores = {str(i): i for i in range(1000)}
+    out = repr(r)
+    assert len(out) < 300
+    assert 'tags=[0, 1, 2, 3, 4, 5, ...]' in out
+    assert '...' in out.split('name=')[1].split(',')[0]
+
+    assert str(util.LazyRepr(r)) == out
+
+    class Attrs(Record):
+        __repr_attrs__ = ['x']
+
+    a = Attrs()
+    a.x = 3
+    assert repr(a) == 'Attrs(x=3)'
+
+    class Plain:
+        def __init__(self):
+            self.y = 2
+
+    assert util.typelet_repr(Plain(), ['y']) == 'Plain(y=2)'
+    assert util.typelet_repr(Plain()) == 'Plain()'
+    assert util.typelet_repr(Plain(), ['y']) == 'Plain(y=2)'
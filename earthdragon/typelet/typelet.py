@@ -3,6 +3,8 @@ Type checking primitives. Traits is an overloaded term. Came up with Typelets
 ala IPython Traitlets.
 """
 from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
 import inspect
 import uuid
 import inspect
@@ -21,7 +23,83 @@ class TypeletMissing:
     pass
 _missing = TypeletMissing()
 
+_validation = ContextVar('earthdragon_typelet_validation', default=True)
+
+
+@contextmanager
+def skip_validation():
+    """
+    Store typelet values without validating them. Meant for trusted paths
+    like loading our own serialized data, where the values were validated
+    when they were first set.
+
+    with skip_validation():
+        objs = [Record(**row) for row in rows]
+    """
+    token = _validation.set(False)
+    try:
+        yield
+    finally:
+        _validation.reset(token)
+
+
+def validates(obj):
+    """
+    Whether values set on obj should be validated. False inside
+    skip_validation or for classes created with validate=False.
+    """
+    return class_validates(type(obj))
+
+
+def class_validates(cls):
+    return _validation.get() and getattr(cls, '_earthdragon_validate', True)
+
+
+def numpy_dtype(values):
+    """
+    values.dtype if it's a numpy dtype, None for anything else, including
+    pandas extension dtypes like Int64 or datetime64[ns, UTC] whose kind
+    doesn't say what the elements are.
+    """
+    dtype = getattr(values, 'dtype', None)
+    if dtype is None:
+        return None
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    if isinstance(dtype, np.dtype):
+        return dtype
+    return None
+
+
+def column_list(values):
+    """
+    Column of values as a list of python objects. numpy/pandas columns are
+    converted in one tolist call. datetime64 goes through microseconds so
+    we get datetime objects instead of ints.
+    """
+    if isinstance(values, list):
+        return values
+    if hasattr(values, 'tolist'):
+        dtype = numpy_dtype(values)
+        if dtype is not None and dtype.kind == 'M':
+            values = values.astype('datetime64[us]')
+        return values.tolist()
+    return list(values)
+
 class Typelet:
+    # numpy dtype kinds whose elements always pass validate. Lets
+    # validate_column accept a whole array by looking at its dtype.
+    column_kinds = ''
+
+    # member descriptor of the slot backing this typelet. Set by TypeletMeta
+    # for classes created with slots=True via set_slot, otherwise values live
+    # in the instance __dict__.
+    slot = None
+    _slot_get = None
+    _slot_set = None
+
     def __init__(self, **kwargs):
         self.value = None
         self.name = None
@@ -40,16 +118,60 @@ class Typelet:
 
     def __get__(self, obj, cls=None):
         if obj is None:
-            obj = cls
-        name = self.get_name(obj)
+            name = self.name or self.get_name(cls)
+            return cls.__dict__.get(name, self.default)
+
+        slot_get = self._slot_get
+        if slot_get is not None:
+            try:
+                return slot_get(obj)
+            except AttributeError:
+                return self.default
+        name = self.name or self.get_name(obj)
         return obj.__dict__.get(name, self.default)
 
     def __set__(self, obj, value):
-        new_value = self._validate(obj, value)
-        name = self.get_name(obj)
-        obj.__dict__[name] = new_value
+        # validates(obj), inlined since this is the hot path
+        if _validation.get() \
+                and getattr(type(obj), '_earthdragon_validate', True):
+            value = self._validate(obj, value)
+        self._store(obj, value)
+
+    def _store(self, obj, value):
+        """ write value to storage without validation """
+        slot_set = self._slot_set
+        if slot_set is not None:
+            slot_set(obj, value)
+            return
+        name = self.name or self.get_name(obj)
+        obj.__dict__[name] = value
+
+    def _load(self, obj):
+        """ stored value, without falling back to the default """
+        slot_get = self._slot_get
+        if slot_get is not None:
+            return slot_get(obj)
+        name = self.name or self.get_name(obj)
+        try:
+            return obj.__dict__[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def set_slot(self, slot):
+        self.slot = slot
+        self._slot_get = slot.__get__
+        self._slot_set = slot.__set__
+
+    def __set_name__(self, owner, name):
+        # first class wins if the same typelet is assigned more than once
+        if self.name is None:
+            self.name = name
 
     def get_name(self, obj):
+        """
+        Fallback for typelets attached after class creation, which don't
+        get __set_name__ called. Searches the class dicts along the mro.
+        """
         if self.name is None:
             self.name = _get_name(obj, self)
         return self.name
@@ -67,6 +189,59 @@ class Typelet:
     def validate(self, value):
         return value
 
+    def inline_check(self, value, ref):
+        """
+        Source for an expression that is True when `value` is valid. Used by
+        generated code to skip the validate call. `ref` is the name this
+        typelet is bound to in the generated code. None means the code has
+        to call _validate.
+
+        The generated code's parameters are the typelet names, which can
+        shadow any global. Builtins and modules are available as __isinstance,
+        __int, __str, __bool, __numbers, __datetime and __uuid, see
+        util._init_namespace.
+        """
+        return None
+
+    def inlinable(self):
+        """
+        inline_check is only a stand in for validate when both come from the
+        same class. A subclass overriding validate falls back to the call.
+        """
+        return self._same_owner('validate', 'inline_check')
+
+    def _same_owner(self, *names):
+        def owner(name):
+            for klass in type(self).__mro__:
+                if name in klass.__dict__:
+                    return klass
+        return len(set(map(owner, names))) == 1
+
+    def validate_column(self, values):
+        """
+        Validate a column of values at once and return them as a list.
+        Array columns with a numpy dtype kind in column_kinds skip the per
+        element validate. Like inline_check, the shortcut is only used when
+        column_kinds and validate come from the same class. Extension dtypes
+        are validated per element, a nullable Int64 column can hold pd.NA.
+        """
+        dtype = numpy_dtype(values)
+        kind = dtype is not None and dtype.kind
+        if kind and kind in self.column_kinds \
+                and self._same_owner('validate', 'column_kinds') \
+                and self.check_column(values):
+            return column_list(values)
+
+        _validate = self._validate
+        return [_validate(None, v) for v in column_list(values)]
+
+    def check_column(self, values):
+        """
+        Extra whole column check for the column_kinds shortcut. False falls
+        back to validating each element.
+        """
+        return True
+
     def error(self, value, obj=None):
         class_name = type(self).__name__
         value_name = type(value).__name__
@@ -74,12 +249,19 @@ class Typelet:
         raise TypeletError(msg)
 
 class Unicode(Typelet):
+    column_kinds = 'U'
+
     def validate(self, value):
         if isinstance(value, str):
             return value
         self.error(value)
 
+    def inline_check(self, value, ref):
+        return f'__isinstance({value}, __str)'
+
 class Int(Typelet):
+    column_kinds = 'biu'
+
     def __init__(self, min=None, max=None, **kwargs):
         self.min = min
         self.max = max
@@ -101,30 +283,69 @@ class Int(Typelet):
             return value
         self.error(value)
 
+    def inline_check(self, value, ref):
+        check = f'__isinstance({value}, __int)'
+        if self.min is not None:
+            check += f' and {ref}.min <= {value}'
+        if self.max is not None:
+            check += f' and {ref}.max >= {value}'
+        return check
+
+    def check_column(self, values):
+        if not len(values):
+            return True
+        if self.min is not None and values.min() < self.min:
+            return False
+        if self.max is not None and values.max() > self.max:
+            return False
+        return True
+
 class Float(Typelet):
+    column_kinds = 'biufc'
+
     def validate(self, value):
         if isinstance(value, numbers.Number):
             return value
         self.error(value)
 
+    def inline_check(self, value, ref):
+        return f'__isinstance({value}, __numbers.Number)'
+
 class Bool(Typelet):
+    column_kinds = 'b'
+
     def validate(self, value):
         if isinstance(value, bool):
             return value
         self.error(value)
 
+    def inline_check(self, value, ref):
+        return f'__isinstance({value}, __bool)'
+
 class UUID(Typelet):
     def validate(self, value):
         if isinstance(value, uuid.UUID):
             return value
         self.error(value)
 
+    def inline_check(self, value, ref):
+        return f'__isinstance({value}, __uuid.UUID)'
+
 class Datetime(Typelet):
+    column_kinds = 'M'
+
     def validate(self, value):
         if isinstance(value, datetime.datetime):
             return value
         self.error(value)
 
+    def check_column(self, values):
+        # NaT
+        return not (values != values).any()
+
+    def inline_check(self, value, ref):
+        return f'__isinstance({value}, __datetime.datetime)'
+
 class Type(Typelet):
     def __init__(self, _class, **kwargs):
         self.check_class = _class
@@ -135,6 +356,9 @@ class Type(Typelet):
             return value
         self.error(value)
 
+    def inline_check(self, value, ref):
+        return f'__isinstance({value}, {ref}.check_class)'
+
 def grab_class_reference(obj, class_name):
     """ Grab class ref from the module that object is defined in """
     modname = obj.__class__.__module__
@@ -143,10 +367,126 @@ def grab_class_reference(obj, class_name):
     check_class = getattr(mod, class_name, None)
     return check_class
 
+def _check_item(value, check_class):
+    if check_class is not None and not isinstance(value, check_class):
+        raise TypeletError(
+            "Collection can only contain {type}".format(type=check_class)
+        )
+
+
+def _check_key(key, key_class):
+    if key_class is not None and not isinstance(key, key_class):
+        raise KeyTypeError("Keys must be {type} type".format(
+            type=str(key_class)
+        ))
+
+
+class TypedList(list):
+    """
+    list that type checks items as they are added. Collection typelets
+    store these so that validation happens once per item instead of
+    rescanning the whole list on every assignment.
+    """
+    # class level so unpickling, which appends before setting state,
+    # doesn't trip over a missing attribute.
+    check_class = None
+
+    def __init__(self, iterable=(), check_class=None):
+        self.check_class = check_class
+        super().__init__(iterable)
+        for value in self:
+            _check_item(value, check_class)
+
+    @classmethod
+    def wrap(cls, values, check_class):
+        """ build from values that were already validated """
+        new = cls()
+        list.extend(new, values)
+        new.check_class = check_class
+        return new
+
+    def append(self, value):
+        _check_item(value, self.check_class)
+        super().append(value)
+
+    def insert(self, index, value):
+        _check_item(value, self.check_class)
+        super().insert(index, value)
+
+    def extend(self, values):
+        values = list(values)
+        for value in values:
+            _check_item(value, self.check_class)
+        super().extend(values)
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            for v in value:
+                _check_item(v, self.check_class)
+        else:
+            _check_item(value, self.check_class)
+        super().__setitem__(index, value)
+
+
+class TypedDict(dict):
+    """
+    dict that type checks keys and values as they are added.
+    """
+    check_class = None
+    key_class = None
+
+    def __init__(self, *args, check_class=None, key_class=None, **kwargs):
+        self.check_class = check_class
+        self.key_class = key_class
+        super().__init__(*args, **kwargs)
+        self._check_items(self)
+
+    @classmethod
+    def wrap(cls, values, check_class, key_class=None):
+        """ build from values that were already validated """
+        new = cls()
+        dict.update(new, values)
+        new.check_class = check_class
+        new.key_class = key_class
+        return new
+
+    def _check_items(self, items):
+        for k, v in items.items():
+            _check_key(k, self.key_class)
+            _check_item(v, self.check_class)
+
+    def __setitem__(self, key, value):
+        _check_key(key, self.key_class)
+        _check_item(value, self.check_class)
+        super().__setitem__(key, value)
+
+    def update(self, *args, **kwargs):
+        items = dict(*args, **kwargs)
+        self._check_items(items)
+        super().update(items)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+
 class Collection(Typelet):
 
-    # TODO replace list with a type checking list
     container_class = list
+    # checked container values are stored as. None stores value as is.
+    # A plain list/dict is copied into it, so the caller's object is no
+    # longer an alias of the stored value. Reassign after mutating it.
+    typed_class = None
 
     def __init__(self, _class, **kwargs):
         self._class = _class
@@ -165,11 +505,30 @@ class Collection(Typelet):
         check_class = self.check_class
         for v in values:
             if not isinstance(v, check_class):
-                raise TypeletError("Collection can only contain {type}")
+                raise TypeletError(
+                    "Collection can only contain {type}".format(
+                        type=check_class
+                    )
+                )
 
     def values(self, obj):
         return obj
 
+    def is_checked(self, value):
+        """
+        value is a typed container that already enforces our checks, so
+        there's nothing to rescan.
+        """
+        return (
+            type(value) is self.typed_class
+            and value.check_class is self.check_class
+        )
+
+    def wrap(self, value):
+        if self.typed_class is None:
+            return value
+        return self.typed_class.wrap(value, self.check_class)
+
     def _validate(self, obj, value):
         if self.check_class is None:
             self.check_class = grab_class_reference(obj, self._class)
@@ -177,17 +536,21 @@ class Collection(Typelet):
 
     def validate(self, value):
         self._check_container_class(value)
+        if self.is_checked(value):
+            return value
         self._check_collection_values(self.values(value))
-        return value
+        return self.wrap(value)
 
 class List(Collection):
     container_class = list
+    typed_class = TypedList
 
 class Deque(Collection):
     container_class = deque
 
 class Dict(Collection):
     container_class = dict
+    typed_class = TypedDict
 
     def __init__(self, _class, **kwargs):
         self.key_class = kwargs.pop('key_class', None)
@@ -205,7 +568,19 @@ class Dict(Collection):
                     type=str(self.key_class)
                 ))
 
+    def is_checked(self, value):
+        return (
+            super().is_checked(value)
+            and value.key_class is self.key_class
+        )
+
+    def wrap(self, value):
+        return self.typed_class.wrap(value, self.check_class, self.key_class)
+
     def validate(self, value):
-        value = super().validate(value)
+        self._check_container_class(value)
+        if self.is_checked(value):
+            return value
+        self._check_collection_values(self.values(value))
         self._validate_keys(value)
-        return value
+        return self.wrap(value)
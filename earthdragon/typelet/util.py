@@ -1,25 +1,174 @@
 """
 Utilities for integrating Typelet into classes.
 """
-from collections import OrderedDict
-from .typelet import Typelet, TypeletMissing
+from collections import OrderedDict, deque
+from collections.abc import Mapping, Sequence
+import datetime
+import itertools
+import numbers
+import reprlib
+import uuid
+import weakref
+
+from .typelet import (
+    Typelet,
+    TypeletMissing,
+    _missing,
+    validates,
+    class_validates,
+    column_list,
+)
 
 class TypeletMeta(type):
     """
     Metaclass that makes classes Typelet aware. The most important
     part is replacing the class dict with an OrderedDict so we retain
     the order that typelet are defined.
+
+    slots : bool
+        Store this class's typelet values in __slots__ instead of the
+        instance __dict__. Instances only lose their __dict__ when every
+        base also uses slots. Add '__dict__' to __slots__ to keep it.
+
+        class Point(metaclass=TypeletMeta, slots=True):
+            x = Int()
+            y = Int()
+
+    init : bool
+        Generate an __init__ that takes every typelet, ancestors first, as a
+        positional or keyword arg. See make_init. Ignored if the class
+        defines __init__.
+
+    frozen : bool
+        Immutable, interned value objects. Construction goes through a
+        generated __new__ that returns the existing instance when one with
+        equal values (of the same types) is alive, so equal objects are the
+        same object. Assignment raises FrozenInstanceError. Implies init,
+        defining __init__ is an error. Inherited by subclasses.
+
+        class Currency(metaclass=TypeletMeta, frozen=True, slots=True):
+            code = Unicode(required=True)
+
+        Currency('USD') is Currency(code='USD')
+
+    validate : bool
+        validate=False skips typelet validation for instances of this class
+        and its subclasses, for classes only built from trusted data. See
+        skip_validation to turn it off for a block of code instead.
     """
-    def __prepare__(name, bases):
+    def __prepare__(name, bases, **kwargs):
         mdict = OrderedDict()
         return mdict
 
-    def __new__(cls, name, bases, dct):
-        typelets, merged, tro = gather_typelets(dct, bases)
+    def __new__(cls, name, bases, dct, slots=False, init=False,
+                validate=None, frozen=None):
+        typelets, tro = gather_typelets(dct, bases)
         dct['_earthdragon_typelets'] = typelets
-        dct['_earthdragon_merged_typelets'] = merged
         dct['_earthdragon_tro'] = tro
-        return super().__new__(cls, name, bases, dct)
+        if validate is not None:
+            dct['_earthdragon_validate'] = validate
+
+        if frozen is None:
+            frozen = any(
+                getattr(base, '_earthdragon_frozen', False) for base in bases
+            )
+        if frozen:
+            if '__init__' in dct:
+                raise TypeError(
+                    "frozen typelet class {name} can't define __init__".format(
+                        name=name)
+                )
+            dct['_earthdragon_frozen'] = True
+            dct.setdefault('__setattr__', _frozen_setattr)
+            dct.setdefault('__delattr__', _frozen_delattr)
+            dct.setdefault('__reduce__', _frozen_reduce)
+            dct.setdefault('__copy__', _frozen_copy)
+            dct.setdefault('__deepcopy__', _frozen_deepcopy)
+
+        if slots:
+            dct['__slots__'] = slot_names(dct, typelets)
+            # the intern table holds weakrefs
+            if frozen and not any(b.__weakrefoffset__ for b in bases):
+                dct['__slots__'] += ('__weakref__',)
+
+        new_cls = super().__new__(cls, name, bases, dct)
+        new_cls._earthdragon_merged_typelets = merged_typelets(new_cls)
+
+        if slots:
+            for attr, typelet in typelets.items():
+                typelet.set_slot(new_cls.__dict__[slot_name(attr)])
+
+        if frozen:
+            new_cls._earthdragon_interned = weakref.WeakValueDictionary()
+            # interned instances created inside skip_validation
+            new_cls._earthdragon_unchecked = weakref.WeakValueDictionary()
+            new, key = make_frozen_new(new_cls)
+            new_cls.__new__ = staticmethod(new)
+            new_cls._earthdragon_key = staticmethod(key)
+            new_cls.__init__ = _frozen_init
+        elif init and '__init__' not in dct:
+            new_cls.__init__ = make_init(new_cls)
+        return new_cls
+
+    def from_columns(cls, lazy=False, **columns):
+        """
+        Build one instance per row from columns of typelet values. Each
+        column is validated once with Typelet.validate_column, so numpy or
+        pandas columns of a matching dtype aren't checked element by element.
+        Instances are created without calling __init__.
+
+        Record.from_columns(x=np.arange(10), y=names)
+        Record.from_columns(**df)
+
+        lazy : bool
+            Return a TypeletRows sequence that creates instances on access
+            instead of a list.
+        """
+        columns = validate_columns(cls, columns)
+        rows = TypeletRows(cls, columns)
+        if lazy:
+            return rows
+        return list(rows)
+
+    def from_records(cls, records, lazy=False):
+        """
+        from_columns for an iterable of rows. Rows are mappings with the same
+        keys as the first row, or sequences in init_typelets order.
+        """
+        records = list(records)
+        if not records:
+            return cls.from_columns(lazy=lazy)
+
+        first = records[0]
+        if isinstance(first, Mapping):
+            try:
+                columns = {
+                    name: [record[name] for record in records]
+                    for name in first
+                }
+            except KeyError as e:
+                raise InvalidInitInvocation(
+                    "Record missing {name!r}".format(name=e.args[0])
+                )
+        else:
+            names = list(init_typelets(cls))
+            if any(len(record) > len(names) for record in records):
+                raise InvalidInitInvocation("Passed too many positional values")
+            if any(len(record) != len(first) for record in records):
+                raise InvalidInitInvocation("Records differ in length")
+            columns = dict(zip(names, map(list, zip(*records))))
+        return cls.from_columns(lazy=lazy, **columns)
+
+
+def slot_name(name):
+    return '_typelet_' + name
+
+
+def slot_names(dct, typelets):
+    existing = dct.get('__slots__', ())
+    if isinstance(existing, str):
+        existing = (existing,)
+    return tuple(existing) + tuple(map(slot_name, typelets))
 
 
 def _gather_typelets(dct, key='_earthdragon_typelets'):
@@ -33,37 +182,196 @@ def _gather_typelets(dct, key='_earthdragon_typelets'):
     return typelets
 
 
-def gather_typelets(dct, bases=[]):
+# typelets found on bases that weren't created by TypeletMeta
+_plain_base_typelets = weakref.WeakKeyDictionary()
+
+
+def own_typelets(klass):
+    """
+    Typelets declared on klass itself. Only classes that aren't TypeletMeta
+    classes need their dict scanned, and that scan is cached.
+    """
+    typelets = klass.__dict__.get('_earthdragon_typelets')
+    if typelets is not None:
+        return typelets
+
+    try:
+        return _plain_base_typelets[klass]
+    except KeyError:
+        pass
+    typelets = _gather_typelets(klass.__dict__)
+    _plain_base_typelets[klass] = typelets
+    return typelets
+
+
+def base_typelets(base):
+    """ Merged typelets of base """
+    merged = base.__dict__.get('_earthdragon_merged_typelets')
+    if merged is not None:
+        return merged
+    return own_typelets(base)
+
+
+def merged_typelets(cls):
+    """
+    Every typelet on cls, ancestors first. Walks the mro so the typelet
+    for each name is the one attribute lookup finds.
+    """
+    merged = OrderedDict()
+    for klass in reversed(cls.__mro__):
+        merged.update(own_typelets(klass))
+    return merged
+
+
+def gather_typelets(dct, bases=()):
+    """
+    Returns (typelets, tro) for a new class. The merged typelets need the
+    class's mro, see merged_typelets.
+
+    typelets : typelets declared in dct.
+    tro : typelet resolution order. [(ancestor, merged typelets)],
+        ancestors first. Built from the bases' tro so only the direct
+        bases are new.
+    """
     current_typelets = _gather_typelets(dct)
-    merged_typelets = current_typelets.copy()
+
+    if len(bases) == 1:
+        base = bases[0]
+        tro = base.__dict__.get('_earthdragon_tro', []).copy()
+        tro.append((base, base_typelets(base)))
+        return current_typelets, tro
+
     tro = []
+    seen = set()
     for base in bases:
-        if '_eartdragon_tro' in base.__dict__:
-            tro = base.__dict__['_earthdragon_tro'].copy()
-            break
+        inherited = base.__dict__.get('_earthdragon_tro', [])
+        for klass, typelets in inherited + [(base, base_typelets(base))]:
+            if klass in seen:
+                continue
+            seen.add(klass)
+            tro.append((klass, typelets))
+    return current_typelets, tro
+
+
+class _Repr(reprlib.Repr):
+    """ reprlib.Repr that keeps dicts in insertion order instead of sorting """
+    def repr_dict(self, x, level):
+        if not x:
+            return '{}'
+        if level <= 0:
+            return '{...}'
+        newlevel = level - 1
+        repr1 = self.repr1
+        pieces = [
+            '{k}: {v}'.format(k=repr1(k, newlevel), v=repr1(v, newlevel))
+            for k, v in itertools.islice(x.items(), self.maxdict)
+        ]
+        if len(x) > self.maxdict:
+            pieces.append('...')
+        return '{%s}' % ', '.join(pieces)
 
-    for base in bases:
-        typelets = _gather_typelets(base.__dict__,
-                '_earthdragon_merged_typelets')
-        merged_typelets.update(typelets)
-        tro.append((base, typelets))
-    return current_typelets, merged_typelets, tro
+
+# reprlib limits for typelet_repr. Change the attributes to adjust.
+repr_limits = _Repr()
+repr_limits.maxstring = 80
+repr_limits.maxother = 80
+
+_repr_templates = weakref.WeakKeyDictionary()
+
+# values whose str is already short and cheap
+_plain_types = (int, float, bool, type(None))
 
 
 def typelet_repr(self, typelets=None):
     """
     Repr utility that will default to printing the
-    class and its typelets
+    class and its typelets.
+
+    Output is bounded by repr_limits: long strings and large containers are
+    truncated reprlib style, so objects holding big collections are still
+    cheap to log. The template is cached per class. Use full_repr for the
+    untruncated version.
     """
     class_ = self.__class__
-    class_name = class_.__name__
+    try:
+        template, attrs = _repr_templates[class_]
+    except KeyError:
+        attrs = _repr_attrs(class_, typelets)
+        template = _template(class_, attrs)
+        # typelets passed in only apply when the class has neither
+        if hasattr(class_, '__repr_attrs__') \
+                or hasattr(class_, '_earthdragon_typelets'):
+            _repr_templates[class_] = template, attrs
+    return template.format(*[repr_value(getattr(self, k)) for k in attrs])
 
+
+def full_repr(self, typelets=None):
+    """ typelet_repr without truncation """
+    return _typelet_repr(self, _repr_attrs(self.__class__, typelets))
+
+
+def _repr_attrs(class_, typelets):
     attrs = typelets or []
     if hasattr(class_, '_earthdragon_typelets'):
         attrs = getattr(class_, '_earthdragon_typelets')
     if hasattr(class_, '__repr_attrs__'):
         attrs = getattr(class_, '__repr_attrs__')
-    return _typelet_repr(self, attrs)
+    return attrs
+
+
+def _template(class_, attrs):
+    bits = ', '.join(f'{k}={{}}' for k in attrs)
+    return class_.__name__ + '(' + bits + ')'
+
+
+def repr_value(value):
+    """
+    Same as "{v}".format(v=value) for short values, truncated per
+    repr_limits otherwise.
+    """
+    if type(value) in _plain_types:
+        return str(value)
+
+    level = repr_limits.maxlevel
+    if isinstance(value, str):
+        maxstring = repr_limits.maxstring
+        if len(value) <= maxstring:
+            return value
+        i = max(0, (maxstring - 3) // 2)
+        j = max(0, maxstring - 3 - i)
+        return value[:i] + '...' + value[len(value)-j:]
+    if isinstance(value, dict):
+        return repr_limits.repr_dict(value, level)
+    if isinstance(value, list):
+        return repr_limits.repr_list(value, level)
+    if isinstance(value, tuple):
+        return repr_limits.repr_tuple(value, level)
+    if isinstance(value, deque):
+        return repr_limits.repr_deque(value, level)
+    if isinstance(value, frozenset):
+        return repr_limits.repr_frozenset(value, level)
+    if isinstance(value, set):
+        return repr_limits.repr_set(value, level)
+    return "{v}".format(v=value)
+
+
+class LazyRepr:
+    """
+    Defers typelet_repr until the value is actually formatted, for log
+    calls that are usually filtered out.
+
+    logger.debug("state %s", LazyRepr(obj))
+    """
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __repr__(self):
+        return typelet_repr(self.obj)
+
+    __str__ = __repr__
+
 
 def _typelet_repr(self, attrs):
     class_ = self.__class__
@@ -81,6 +389,410 @@ class InvalidInitInvocation(Exception):
     pass
 
 
+def init_typelets(cls):
+    """
+    All typelets of cls, ancestors first. An overridden typelet keeps the
+    position of the one it overrides.
+    """
+    typelets = OrderedDict()
+    for klass in reversed(cls.__mro__):
+        typelets.update(klass.__dict__.get('_earthdragon_typelets', {}))
+    return typelets
+
+
+def _init_namespace():
+    """
+    Globals for the generated functions. Their parameters are the typelet
+    names, so anything else the code refers to is bound under a __ name,
+    which can't be a typelet name as the class body would mangle it. See
+    Typelet.inline_check.
+    """
+    return {
+        '__missing': _missing,
+        '__InvalidInitInvocation': InvalidInitInvocation,
+        '__validates': validates,
+        '__isinstance': isinstance,
+        '__type': type,
+        '__bool': bool,
+        '__int': int,
+        '__str': str,
+        '__datetime': datetime,
+        '__numbers': numbers,
+        '__uuid': uuid,
+    }
+
+
+def _init_body(typelets, ns, validate=True, store=True):
+    """
+    Lines that validate and store each typelet arg on __self. Shared by
+    make_init and make_frozen_new, which validates every arg before storing
+    any so the intern key is built from validated values.
+    """
+    body = []
+    if store and any(t.slot is None for t in typelets.values()):
+        body.append('__dict = __self.__dict__')
+    if validate and typelets:
+        body.append('__validate = __validates(__self)')
+
+    for name, typelet in typelets.items():
+        ref = f'__t_{name}'
+        ns[ref] = typelet
+
+        body.append(f'if {name} is not __missing:')
+        if validate:
+            check = typelet.inlinable() and typelet.inline_check(name, ref)
+            if check:
+                body.append(f'    if __validate and not ({check}):')
+                body.append(f'        {ref}.error({name}, __self)')
+            else:
+                body.append('    if __validate:')
+                body.append(
+                    f'        {name} = {ref}._validate(__self, {name})')
+
+        if store:
+            if typelet.slot is not None:
+                setter = f'__set_{name}'
+                ns[setter] = typelet._slot_set
+                body.append(f'    {setter}(__self, {name})')
+            else:
+                body.append(f'    __dict[{name!r}] = {name}')
+
+        if validate and typelet.required:
+            body.append('else:')
+            body.append(
+                '    raise __InvalidInitInvocation('
+                '"All required typelets must be passed in")'
+            )
+    return body
+
+
+def _compile(cls, name, params, body, ns):
+    lines = [f"def {name}({', '.join(params)}):"]
+    lines += ['    ' + line for line in body]
+    exec('\n'.join(lines), ns)
+    func = ns[name]
+    func.__qualname__ = f'{cls.__qualname__}.{name}'
+    func.__module__ = cls.__module__
+    return func
+
+
+def make_init(cls):
+    """
+    Generate a specialized __init__ for cls. Roughly inflate with
+    typelets_only=True, but as a single function:
+
+    def __init__(__self, x=__missing, y=__missing):
+        __dict = __self.__dict__
+        __validate = __validates(__self)
+        if x is not __missing:
+            if __validate and not (__isinstance(x, __int)):
+                __t_x.error(x, __self)
+            __dict['x'] = x
+        else:  # only when x is required
+            raise __InvalidInitInvocation(...)
+        ...
+
+    Checks for the builtin typelets are inlined, anything else goes through
+    Typelet._validate. Values are written to storage directly, so a class
+    level __setattr__ is not called. Unpassed typelets are left unset and
+    fall back to their defaults. Checks are skipped when validates(self) is
+    False.
+    """
+    typelets = init_typelets(cls)
+    ns = _init_namespace()
+    params = ['__self'] + [f'{name}=__missing' for name in typelets]
+    body = _init_body(typelets, ns) or ['pass']
+    return _compile(cls, '__init__', params, body, ns)
+
+
+def make_frozen_new(cls):
+    """
+    Generate __new__ and the intern key function for a frozen class:
+
+    def __new__(__cls, x=__missing, y=__missing):
+        __key = (__type(x), x, __type(y), y)
+        try:
+            __self = __interned[__key]
+        except (KeyError, TypeError):  # TypeError: unhashable, not interned
+            pass
+        else:
+            if __key not in __unchecked:
+                return __self
+        __self = __object_new(__cls)
+        ...  # make_init validation
+        __key = (__type(x), x, __type(y), y)
+        try:
+            __hit = __interned[__key]
+        except KeyError:
+            pass
+        except TypeError:
+            __key = None
+        else:
+            if __validate:
+                __unchecked_table.pop(__key, None)
+            return __hit
+        ...  # make_init storage
+        if __key is not None:
+            __interned[__key] = __self
+            if not __validate:
+                __unchecked_table[__key] = __self
+        return __self
+
+    Types are part of the key so Point(1, 2) and Point(1.0, 2) stay
+    distinct. A hit skips validation, the cached instance already passed.
+    Instances interned inside skip_validation are tracked in
+    _earthdragon_unchecked and only returned once the args validate, with
+    the key rebuilt from the validated values. Classes created with
+    validate=False never validate, so they skip that bookkeeping.
+    """
+    typelets = init_typelets(cls)
+    ns = _init_namespace()
+    ns['__interned'] = cls._earthdragon_interned
+    ns['__object_new'] = object.__new__
+    # checked against the WeakValueDictionary's dict, the common empty case
+    # stays a C level lookup
+    ns['__unchecked'] = cls._earthdragon_unchecked.data
+    ns['__unchecked_table'] = cls._earthdragon_unchecked
+    track = typelets and getattr(cls, '_earthdragon_validate', True)
+
+    args = [f'{name}=__missing' for name in typelets]
+    key = ''.join(f'__type({name}), {name}, ' for name in typelets)
+    key = f'({key})'
+
+    body = [
+        f'__key = {key}',
+        'try:',
+        '    __self = __interned[__key]',
+        'except (KeyError, TypeError):',
+        '    pass',
+        'else:',
+    ]
+    if track:
+        body += [
+            '    if __key not in __unchecked:',
+            '        return __self',
+        ]
+    else:
+        body.append('    return __self')
+
+    body.append('__self = __object_new(__cls)')
+    body += _init_body(typelets, ns, store=False)
+    body += [
+        f'__key = {key}',
+        'try:',
+        '    __hit = __interned[__key]',
+        'except KeyError:',
+        '    pass',
+        'except TypeError:',
+        '    __key = None',
+        'else:',
+    ]
+    if track:
+        body += [
+            '    if __validate:',
+            '        __unchecked_table.pop(__key, None)',
+        ]
+    body.append('    return __hit')
+    body += _init_body(typelets, ns, validate=False)
+    body += [
+        'if __key is not None:',
+        '    __interned[__key] = __self',
+    ]
+    if track:
+        body += [
+            '    if not __validate:',
+            '        __unchecked_table[__key] = __self',
+        ]
+    body.append('return __self')
+    new = _compile(cls, '__new__', ['__cls'] + args, body, ns)
+    key_func = _compile(cls, '_earthdragon_key', args, [f'return {key}'], ns)
+    return new, key_func
+
+
+class FrozenInstanceError(AttributeError):
+    pass
+
+
+def _frozen_setattr(self, name, value):
+    raise FrozenInstanceError("cannot assign to {name!r} of frozen {cls}".format(
+        name=name, cls=type(self).__name__))
+
+
+def _frozen_delattr(self, name):
+    raise FrozenInstanceError("cannot delete {name!r} of frozen {cls}".format(
+        name=name, cls=type(self).__name__))
+
+
+def _frozen_init(__self, *args, **kwargs):
+    # the generated __new__ did the work. __self so a typelet named self
+    # can be passed by keyword
+    pass
+
+
+def _frozen_reduce(self):
+    return _frozen_new, (type(self), stored_values(self))
+
+
+def _frozen_new(cls, values):
+    return cls(**values)
+
+
+def _frozen_copy(self):
+    return self
+
+
+def _frozen_deepcopy(self, memo):
+    return self
+
+
+def stored_values(obj):
+    """ {name: value} of the typelets set on obj, defaults aren't included """
+    values = {}
+    for name, typelet in init_typelets(type(obj)).items():
+        try:
+            values[name] = typelet._load(obj)
+        except AttributeError:
+            pass
+    return values
+
+
+def blank(cls):
+    """
+    Uninitialized instance of cls to fill in with Typelet._store and then
+    pass through intern. Frozen classes skip their generated __new__.
+    """
+    if getattr(cls, '_earthdragon_frozen', False):
+        return object.__new__(cls)
+    return cls.__new__(cls)
+
+
+def intern(obj):
+    """
+    Canonical instance for obj if its class is frozen, registering obj
+    when it's the first with its values. Other objects pass through.
+    """
+    cls = type(obj)
+    if not getattr(cls, '_earthdragon_frozen', False):
+        return obj
+    key = cls._earthdragon_key(**stored_values(obj))
+    interned = cls._earthdragon_interned
+    try:
+        return interned[key]
+    except KeyError:
+        interned[key] = obj
+        if not validates(obj) and getattr(cls, '_earthdragon_validate', True):
+            cls._earthdragon_unchecked[key] = obj
+    except TypeError:
+        pass
+    return obj
+
+
+def validate_columns(cls, columns):
+    """
+    Validated columns as lists, checking that they line up with the
+    typelets of cls.
+    """
+    typelets = init_typelets(cls)
+
+    unknown = set(columns) - set(typelets)
+    if unknown:
+        raise InvalidInitInvocation(
+            "Pass non typelet column {names}".format(names=sorted(unknown))
+        )
+
+    required = {name for name, t in typelets.items() if t.required}
+    if not required <= set(columns):
+        raise InvalidInitInvocation("All required typelets must be passed in")
+
+    validate = class_validates(cls)
+    validated = OrderedDict()
+    for name, values in columns.items():
+        if validate:
+            validated[name] = typelets[name].validate_column(values)
+        else:
+            validated[name] = column_list(values)
+
+    if len(set(map(len, validated.values()))) > 1:
+        raise InvalidInitInvocation("Columns differ in length")
+    return validated
+
+
+class TypeletRows(Sequence):
+    """
+    Row view over validated columns. Indexing creates the instance for that
+    row; instances aren't cached, so rows that are never accessed are never
+    built.
+    """
+    def __init__(self, cls, columns):
+        self.cls = cls
+        self.columns = columns
+        self._make = make_row(cls, list(columns))
+
+    def __len__(self):
+        if not self.columns:
+            return 0
+        return len(next(iter(self.columns.values())))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return TypeletRows(self.cls, OrderedDict(
+                (name, values[key]) for name, values in self.columns.items()
+            ))
+        n = len(self)
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError("row index out of range")
+        return self._make(*[values[key] for values in self.columns.values()])
+
+    def __iter__(self):
+        if not self.columns:
+            return iter(())
+        return map(self._make, *self.columns.values())
+
+    def __repr__(self):
+        return "TypeletRows({cls}, {n} rows)".format(
+            cls=self.cls.__name__, n=len(self)
+        )
+
+
+def make_row(cls, names):
+    """
+    Generate a function that creates an instance of cls from already
+    validated values, without calling __init__:
+
+    def make_row(x, y):
+        __self = __blank(__cls)
+        __dict = __self.__dict__
+        __dict['x'] = x
+        __set_y(__self, y)  # slot backed
+        return __self  # __intern(__self) for frozen classes
+    """
+    typelets = init_typelets(cls)
+    ns = {'__blank': blank, '__cls': cls, '__intern': intern}
+    body = ['__self = __blank(__cls)']
+    if any(typelets[name].slot is None for name in names):
+        body.append('__dict = __self.__dict__')
+
+    for name in names:
+        typelet = typelets[name]
+        if typelet.slot is not None:
+            setter = f'__set_{name}'
+            ns[setter] = typelet._slot_set
+            body.append(f'{setter}(__self, {name})')
+        else:
+            body.append(f'__dict[{name!r}] = {name}')
+    if getattr(cls, '_earthdragon_frozen', False):
+        body.append('return __intern(__self)')
+    else:
+        body.append('return __self')
+
+    lines = [f"def make_row({', '.join(names)}):"]
+    lines += ['    ' + line for line in body]
+    exec('\n'.join(lines), ns)
+    return ns['make_row']
+
+
 def fill(obj, filled, name, value):
     if name in filled:
         raise InvalidInitInvocation("Already filled in '{name}'".format(name=name))